@@ -27,17 +27,21 @@ MONKEY_SPECIES = [
 ]
 
 
-def create_cpu_player(index: int = 0, existing_names: list[str] = None) -> Player:
+def create_cpu_player(existing_names: Optional[set[str]] = None) -> Player:
     """Create a CPU player with a randomly selected monkey species name."""
     if existing_names is None:
-        existing_names = []
+        existing_names = set()
 
-    # Get available names (not already used)
-    available = [n for n in MONKEY_SPECIES if n not in existing_names]
-    if not available:
-        available = MONKEY_SPECIES  # Fallback if somehow all used
+    # A game has at most 4 players, so a random draw is almost always unused
+    for _ in range(8):
+        name = random.choice(MONKEY_SPECIES)
+        if name not in existing_names:
+            break
+    else:
+        # Get available names (not already used)
+        available = [n for n in MONKEY_SPECIES if n not in existing_names]
+        name = random.choice(available or MONKEY_SPECIES)  # Fallback if somehow all used
 
-    name = random.choice(available)
     return Player(name=name, is_cpu=True, connected=True)
 
 
@@ -58,32 +62,34 @@ def get_cpu_move(game: Game, player_id: str) -> Optional[tuple[Domino, str]]:
     if not player:
         return None
 
-    # Score each move
-    scored_moves = []
+    # Score each move, keeping the best one seen so far
+    best_move = None
+    best_score = -1
+    ties = 0
     for domino, side in valid_moves:
-        score = 0
-
-        # Prefer doubles (get rid of them early)
-        if domino.is_double():
-            score += 10
-
         # Prefer higher value tiles
-        score += domino.total()
+        score = domino.total()
 
-        # Slight bonus if we have other tiles matching this domino's values
-        # This helps keep options open
-        for other in player.hand:
-            if other != domino:
-                if other.left in (domino.left, domino.right) or other.right in (domino.left, domino.right):
-                    score += 1
-
-        scored_moves.append((score, domino, side))
-
-    # Sort by score descending, add some randomness for ties
-    scored_moves.sort(key=lambda x: (x[0], random.random()), reverse=True)
-
-    _, best_domino, best_side = scored_moves[0]
-    return (best_domino, best_side)
+        # Slight bonus for each other tile in hand sharing one of this domino's values
+        # This helps keep options open. The pip counts include the domino itself,
+        # which carries both of its values (or one, for a double).
+        if domino.is_double():
+            # Prefer doubles (get rid of them early)
+            score += 10 + player.pip_count(domino.left) - 1
+        else:
+            score += player.pip_count(domino.left) + player.pip_count(domino.right) - 2
+
+        if score > best_score:
+            best_move = (domino, side)
+            best_score = score
+            ties = 1
+        elif score == best_score:
+            # Pick uniformly among equally scored moves
+            ties += 1
+            if game._rng.randrange(ties) == 0:
+                best_move = (domino, side)
+
+    return best_move
 
 
 async def execute_cpu_turn(game: Game, player_id: str) -> tuple[bool, str, Optional[tuple[Domino, str]]]:
@@ -1,57 +1,75 @@
 """Game logic for dominoes."""
-import random
+from collections import deque
 from datetime import datetime
 from typing import Optional
 from .models import Domino, Game, GameStatus, Player, PlayedDomino, BoardEnds
 
 
+# The double-six set never changes, so build it once
+DOMINO_SET: tuple[Domino, ...] = tuple(
+    Domino(left=i, right=j) for i in range(7) for j in range(i, 7)
+)
+
+# Every tile in both orientations, keyed by (left, right), for orienting plays
+ORIENTED_DOMINOES: dict[tuple[int, int], Domino] = {(d.left, d.right): d for d in DOMINO_SET}
+ORIENTED_DOMINOES.update({(d.right, d.left): d.flipped() for d in DOMINO_SET if not d.is_double()})
+
+
+def get_domino(left: object, right: object) -> Optional[Domino]:
+    """Look up the shared tile with these pips, or None if they aren't valid pip values."""
+    try:
+        return ORIENTED_DOMINOES.get((left, right))
+    except TypeError:  # Unhashable input
+        return None
+
+
 def generate_domino_set() -> list[Domino]:
     """Generate a full set of 28 dominoes (double-six)."""
-    dominoes = []
-    for i in range(7):
-        for j in range(i, 7):
-            dominoes.append(Domino(left=i, right=j))
-    return dominoes
+    return list(DOMINO_SET)
 
 
 def shuffle_and_deal(game: Game) -> None:
     """Shuffle dominoes and deal to players."""
     all_dominoes = generate_domino_set()
-    random.shuffle(all_dominoes)
+    game._rng.shuffle(all_dominoes)
 
     # Standard Puerto Rican dominoes: 6 tiles per player
     # Remaining tiles form the boneyard (inaccessible, shown face-down)
     tiles_per_player = 6
 
+    dealt = 0
     for player in game.players:
-        player.hand = all_dominoes[:tiles_per_player]
-        all_dominoes = all_dominoes[tiles_per_player:]
+        player.set_hand(all_dominoes[dealt:dealt + tiles_per_player])
+        dealt += tiles_per_player
 
     # Remaining tiles go to boneyard (for draw variant)
-    game.boneyard = all_dominoes
+    game.boneyard = all_dominoes[dealt:]
+    invalidate_valid_moves(game)
 
 
-def find_starting_player(game: Game) -> str:
+def find_starting_player(game: Game) -> Optional[str]:
     """Find the player with the highest double to start."""
-    best_player_id = None
+    best_double_player_id = None
     best_double = -1
+    # Fallback if nobody holds a double: highest total, tracked in the same pass
+    best_total_player_id = None
+    best_total = -1
 
     for player in game.players:
         for domino in player.hand:
-            if domino.is_double() and domino.left > best_double:
-                best_double = domino.left
-                best_player_id = player.id
+            left = domino.left
+            right = domino.right
+            if left == right and left > best_double:
+                if left == 6:
+                    # Nobody can beat the double six
+                    return player.id
+                best_double = left
+                best_double_player_id = player.id
+            if left + right > best_total:
+                best_total = left + right
+                best_total_player_id = player.id
 
-    # If no doubles, find highest total
-    if best_player_id is None:
-        best_total = -1
-        for player in game.players:
-            for domino in player.hand:
-                if domino.total() > best_total:
-                    best_total = domino.total()
-                    best_player_id = player.id
-
-    return best_player_id
+    return best_double_player_id or best_total_player_id
 
 
 def start_game(game: Game, starting_player_id: str | None = None) -> None:
@@ -63,20 +81,22 @@ def start_game(game: Game, starting_player_id: str | None = None) -> None:
     """
     # Generate and shuffle tiles for picking - assign to fixed grid positions
     all_dominoes = generate_domino_set()
-    random.shuffle(all_dominoes)
+    game._rng.shuffle(all_dominoes)
     game.picking_tiles = {i: tile for i, tile in enumerate(all_dominoes)}
+    game._available_positions = list(game.picking_tiles)
 
     # Clear hands for picking
     for player in game.players:
-        player.hand = []
+        player.set_hand([])
+    invalidate_valid_moves(game)
 
-    game.board = []
+    game.board = deque()
     game.boneyard = []
     game.ends = BoardEnds()
-    game.status = GameStatus.PICKING
+    game.set_status(GameStatus.PICKING)
     game.current_turn = None  # No turn order during picking
-    game.turn_started_at = None
-    game.picking_started_at = datetime.utcnow()  # Start picking timer
+    game.clear_turn_timer()
+    game.start_picking_timer()
 
 
 def start_playing_phase(game: Game, starting_player_id: str | None = None) -> None:
@@ -89,6 +109,7 @@ def start_playing_phase(game: Game, starting_player_id: str | None = None) -> No
     # Remaining tiles go to boneyard
     game.boneyard = list(game.picking_tiles.values())
     game.picking_tiles = {}
+    game._available_positions = []
     game.picking_started_at = None
 
     # Use provided starting player or find by highest double
@@ -97,8 +118,8 @@ def start_playing_phase(game: Game, starting_player_id: str | None = None) -> No
     else:
         game.current_turn = find_starting_player(game)
 
-    game.status = GameStatus.PLAYING
-    game.turn_started_at = datetime.utcnow()  # Start turn timer
+    game.set_status(GameStatus.PLAYING)
+    game.start_turn_timer()
 
 
 def can_play_on_side(domino: Domino, end_value: Optional[int]) -> bool:
@@ -108,35 +129,72 @@ def can_play_on_side(domino: Domino, end_value: Optional[int]) -> bool:
     return domino.left == end_value or domino.right == end_value
 
 
+def invalidate_valid_moves(game: Game) -> None:
+    """Drop cached valid moves. Needed when hands change without a tile being played."""
+    game._valid_moves_cache.clear()
+
+
 def get_valid_moves(game: Game, player_id: str) -> list[tuple[Domino, str]]:
-    """Get all valid moves for a player. Returns list of (domino, side)."""
+    """Get all valid moves for a player. Returns list of (domino, side).
+
+    Results are cached per player until the board changes, so the CPU move,
+    pass check and game-over check of a single ply share one hand scan.
+    The returned list must not be mutated.
+    """
+    # Pack board length and both ends (3 bits each) into one int; an empty board packs to 0
+    key = (len(game.board) << 6) | ((game.ends.left or 0) << 3) | (game.ends.right or 0)
+    if game._valid_moves_key != key:
+        game._valid_moves_cache.clear()
+        game._valid_moves_key = key
+    else:
+        cached = game._valid_moves_cache.get(player_id)
+        if cached is not None:
+            return cached
+
     player = game.get_player(player_id)
     if not player:
         return []
 
     if not game.board:
         # First move - any tile can be played
-        return [(d, "left") for d in player.hand]
-
-    valid_moves = []
-    for domino in player.hand:
-        if can_play_on_side(domino, game.ends.left):
-            valid_moves.append((domino, "left"))
-        if can_play_on_side(domino, game.ends.right) and game.ends.left != game.ends.right:
-            valid_moves.append((domino, "right"))
-
+        valid_moves = [(d, "left") for d in player.hand]
+    elif not (player.pip_count(game.ends.left) or player.pip_count(game.ends.right)):
+        # Nothing in hand matches either end
+        valid_moves = []
+    else:
+        # Match the whole hand against both ends in one pass, reading each tile's pips once
+        left, right = game.ends.left, game.ends.right
+        same_ends = left == right
+        valid_moves = []
+        right_moves = []
+        for d in player.hand:
+            a, b = d.left, d.right
+            if a == left or b == left:
+                valid_moves.append((d, "left"))
+            if not same_ends and (a == right or b == right):
+                right_moves.append((d, "right"))
+        valid_moves += right_moves
+
+    game._valid_moves_cache[player_id] = valid_moves
     return valid_moves
 
 
 def has_valid_move(game: Game, player_id: str) -> bool:
     """Check if a player has any valid moves."""
-    return len(get_valid_moves(game, player_id)) > 0
+    player = game.get_player(player_id)
+    if not player:
+        return False
+    if not game.board:
+        return bool(player.hand)
+    return player.pip_count(game.ends.left) > 0 or player.pip_count(game.ends.right) > 0
 
 
-def play_tile(game: Game, player_id: str, domino: Domino, side: str) -> tuple[bool, str]:
+def play_tile(
+    game: Game, player_id: str, domino: Domino, side: str, now: Optional[datetime] = None
+) -> tuple[bool, str]:
     """
     Play a tile on the board.
-    Returns (success, message).
+    Returns (success, message). `now` is the time the next turn starts at (default: current time).
     """
     if game.status != GameStatus.PLAYING:
         return False, "Game is not in progress"
@@ -148,67 +206,50 @@ def play_tile(game: Game, player_id: str, domino: Domino, side: str) -> tuple[bo
     if not player:
         return False, "Player not found"
 
-    # Find the domino in player's hand
-    hand_domino = None
-    for d in player.hand:
-        if d == domino:
-            hand_domino = d
-            break
-
-    if not hand_domino:
+    if not player.has_tile(domino):
         return False, "You don't have that domino"
 
     # First tile
     if not game.board:
         game.board.append(PlayedDomino(domino=domino, position=0))
         game.ends = BoardEnds(left=domino.left, right=domino.right)
-        player.hand.remove(hand_domino)
-        advance_turn(game)
+        player.remove_tile(domino)
+        advance_turn(game, now)
         check_game_over(game)
         return True, "Tile played"
 
     # Validate and play
     if side == "left":
         target_value = game.ends.left
-        if not can_play_on_side(domino, target_value):
-            return False, f"Domino doesn't match left end ({target_value})"
-
-        # Orient the domino correctly
-        if domino.right == target_value:
-            played_domino = domino
-        else:
-            played_domino = domino.flipped()
-
-        game.board.insert(0, PlayedDomino(domino=played_domino, position=0))
-        game.ends.left = played_domino.left
-
     elif side == "right":
         target_value = game.ends.right
-        if not can_play_on_side(domino, target_value):
-            return False, f"Domino doesn't match right end ({target_value})"
-
-        # Orient the domino correctly
-        if domino.left == target_value:
-            played_domino = domino
-        else:
-            played_domino = domino.flipped()
+    else:
+        return False, "Invalid side (must be 'left' or 'right')"
 
-        game.board.append(PlayedDomino(domino=played_domino, position=len(game.board)))
-        game.ends.right = played_domino.right
+    if not can_play_on_side(domino, target_value):
+        return False, f"Domino doesn't match {side} end ({target_value})"
 
+    # Orient the domino so the matching pip faces the chain; the other pip becomes the new end
+    new_end = domino.total() - target_value
+    if side == "left":
+        played_domino = ORIENTED_DOMINOES[(new_end, target_value)]
+        game.board.appendleft(PlayedDomino(domino=played_domino, position=len(game.board)))
+        game.ends.left = new_end
     else:
-        return False, "Invalid side (must be 'left' or 'right')"
+        played_domino = ORIENTED_DOMINOES[(target_value, new_end)]
+        game.board.append(PlayedDomino(domino=played_domino, position=len(game.board)))
+        game.ends.right = new_end
 
-    player.hand.remove(hand_domino)
-    advance_turn(game)
+    player.remove_tile(domino)
+    advance_turn(game, now)
     check_game_over(game)
     return True, "Tile played"
 
 
-def pass_turn(game: Game, player_id: str) -> tuple[bool, str]:
+def pass_turn(game: Game, player_id: str, now: Optional[datetime] = None) -> tuple[bool, str]:
     """
     Pass the turn (only valid if no moves available).
-    Returns (success, message).
+    Returns (success, message). `now` is the time the next turn starts at (default: current time).
     """
     if game.status != GameStatus.PLAYING:
         return False, "Game is not in progress"
@@ -219,20 +260,20 @@ def pass_turn(game: Game, player_id: str) -> tuple[bool, str]:
     if has_valid_move(game, player_id):
         return False, "You have valid moves available"
 
-    advance_turn(game)
+    advance_turn(game, now)
     check_game_over(game)
     return True, "Turn passed"
 
 
-def advance_turn(game: Game) -> None:
-    """Advance to the next player's turn."""
+def advance_turn(game: Game, now: Optional[datetime] = None) -> None:
+    """Advance to the next player's turn. `now` lets callers share one clock read."""
     if not game.current_turn or not game.players:
         return
 
     current_index = game.get_player_index(game.current_turn)
     next_index = (current_index + 1) % len(game.players)
     game.current_turn = game.players[next_index].id
-    game.turn_started_at = datetime.utcnow()  # Reset turn timer
+    game.start_turn_timer(now)
 
 
 def check_game_over(game: Game) -> bool:
@@ -245,60 +286,70 @@ def check_game_over(game: Game) -> bool:
     # Check if current player (who just played) won by emptying hand
     for player in game.players:
         if len(player.hand) == 0:
-            game.status = GameStatus.FINISHED
+            game.set_status(GameStatus.FINISHED)
             game.winner_id = player.id
+            game.was_blocked = False
             return True
 
-    # Check if all players are blocked (no one can play)
-    all_blocked = all(not has_valid_move(game, p.id) for p in game.players)
-    if all_blocked:
-        game.status = GameStatus.FINISHED
-        # Winner is player with lowest hand total
-        winner = min(game.players, key=lambda p: p.hand_total())
-        game.winner_id = winner.id
-        return True
+    # Check if all players are blocked (no one can play). Before the first
+    # tile anyone holding a tile can play, and the emptied-hand check above
+    # already covered the no-tiles case.
+    if not game.board:
+        return False
+    left, right = game.ends.left, game.ends.right
+    for player in game.players:
+        if player.pip_count(left) or player.pip_count(right):
+            return False
 
-    return False
+    game.set_status(GameStatus.FINISHED)
+    # Winner is player with lowest hand total
+    winner = min(game.players, key=lambda p: p.hand_total())
+    game.winner_id = winner.id
+    game.was_blocked = True
+    return True
 
 
 def calculate_round_score(game: Game) -> dict[str, int]:
     """Calculate scores for a finished round."""
-    scores = {}
-    for player in game.players:
-        scores[player.id] = player.hand_total()
-    return scores
+    return {player.id: player.hand_total() for player in game.players}
 
 
-def calculate_round_points(game: Game) -> tuple[str, int, dict[str, int]]:
+def calculate_round_points(
+    game: Game, remaining_pips: Optional[dict[str, int]] = None
+) -> tuple[Optional[str], int, dict[str, int]]:
     """
     Calculate points awarded for a finished round.
     Returns (winner_id, points_awarded, remaining_pips).
+    Pass remaining_pips from calculate_round_score to reuse it.
 
     Scoring rules:
     - Winner gets sum of all opponents' remaining pips
     - In blocked game, lowest pip count wins, gets difference
     """
-    remaining_pips = {p.id: p.hand_total() for p in game.players}
+    if remaining_pips is None:
+        remaining_pips = calculate_round_score(game)
     winner_id = game.winner_id
 
     if not winner_id:
         return None, 0, remaining_pips
 
     winner = game.get_player(winner_id)
+    winner_pips = remaining_pips.get(winner_id, 0)
+    opponent_pips = sum(remaining_pips.values()) - winner_pips
 
     # If winner has empty hand, they get all opponents' pips
     if winner and len(winner.hand) == 0:
-        points = sum(pips for pid, pips in remaining_pips.items() if pid != winner_id)
+        points = opponent_pips
     else:
         # Blocked game - winner (lowest pips) gets total of opponents minus their own
-        winner_pips = remaining_pips.get(winner_id, 0)
-        points = sum(pips for pid, pips in remaining_pips.items() if pid != winner_id) - winner_pips
-        points = max(0, points)  # Ensure non-negative
+        points = max(0, opponent_pips - winner_pips)  # Ensure non-negative
 
     return winner_id, points, remaining_pips
 
 
-def calculate_team_round_points(game: Game, team_a: list[str], team_b: list[str]) -> tuple[str, int, dict[str, int]]:
+def calculate_team_round_points(
+    game: Game, team_of: dict[str, str]
+) -> tuple[Optional[str], int, dict[str, int]]:
     """
     Calculate team points for a finished round.
     Returns (winning_team, points_awarded, remaining_pips).
@@ -307,31 +358,33 @@ def calculate_team_round_points(game: Game, team_a: list[str], team_b: list[str]
     - Team pip count is sum of both teammates' remaining pips
     - Winning team gets losing team's total pips
     """
-    remaining_pips = {p.id: p.hand_total() for p in game.players}
-
-    team_a_pips = sum(remaining_pips.get(pid, 0) for pid in team_a)
-    team_b_pips = sum(remaining_pips.get(pid, 0) for pid in team_b)
+    remaining_pips: dict[str, int] = {}
+    team_pips = {"team_a": 0, "team_b": 0}
+
+    # Hand totals are kept up to date on each player, so one pass fills everything
+    for p in game.players:
+        pips = p.hand_total()
+        remaining_pips[p.id] = pips
+        team = team_of.get(p.id)
+        if team:
+            team_pips[team] += pips
+    team_a_pips = team_pips["team_a"]
+    team_b_pips = team_pips["team_b"]
 
     winner_id = game.winner_id
 
     # Determine winning team
     if winner_id:
-        if winner_id in team_a:
+        winner = game.get_player(winner_id)
+        dominoed = winner is not None and len(winner.hand) == 0
+        if team_of.get(winner_id) == "team_a":
             winning_team = "team_a"
             # If player dominoed (empty hand), team gets all of opposing team's pips
-            winner = game.get_player(winner_id)
-            if winner and len(winner.hand) == 0:
-                points = team_b_pips
-            else:
-                # Blocked - winning team gets difference
-                points = max(0, team_b_pips - team_a_pips)
+            # Blocked - winning team gets difference
+            points = team_b_pips if dominoed else max(0, team_b_pips - team_a_pips)
         else:
             winning_team = "team_b"
-            winner = game.get_player(winner_id)
-            if winner and len(winner.hand) == 0:
-                points = team_a_pips
-            else:
-                points = max(0, team_a_pips - team_b_pips)
+            points = team_a_pips if dominoed else max(0, team_a_pips - team_b_pips)
     else:
         # No winner (shouldn't happen)
         winning_team = None
@@ -342,15 +395,18 @@ def calculate_team_round_points(game: Game, team_a: list[str], team_b: list[str]
 
 def start_new_round(game: Game) -> None:
     """Reset game state for a new round within a match."""
-    game.status = GameStatus.WAITING
-    game.board = []
+    game.set_status(GameStatus.WAITING)
+    game.board = deque()
     game.boneyard = []
     game.ends = BoardEnds()
     game.winner_id = None
+    game.was_blocked = False
     game.picking_tiles = {}
+    game._available_positions = []
     game.picking_started_at = None
     for player in game.players:
-        player.hand = []
+        player.set_hand([])
+    invalidate_valid_moves(game)
     # Don't reset scores or round_number - those are tracked by Match
 
 
@@ -381,7 +437,9 @@ def claim_tile(game: Game, player_id: str, grid_position: int) -> tuple[bool, st
 
     # Remove tile from grid and add to player's hand
     tile = game.picking_tiles.pop(grid_position)
-    player.hand.append(tile)
+    game._available_positions.remove(grid_position)
+    player.add_tile(tile)
+    invalidate_valid_moves(game)
 
     # Check if picking is complete (all players have 6 tiles)
     if check_picking_complete(game):
@@ -414,7 +472,7 @@ def cpu_claim_tile(game: Game, cpu_player_id: str) -> tuple[bool, str, int | Non
         return False, "No tiles available", None
 
     # Pick a random available grid position
-    grid_position = random.choice(list(game.picking_tiles.keys()))
+    grid_position = game._rng.choice(game._available_positions)
     success, message = claim_tile(game, cpu_player_id, grid_position)
     return success, message, grid_position if success else None
 
@@ -429,12 +487,13 @@ def auto_assign_remaining_tiles(game: Game, player_id: str) -> list[int]:
     if not player:
         return []
 
-    assigned_positions = []
-    while len(player.hand) < 6 and game.picking_tiles:
-        grid_position = random.choice(list(game.picking_tiles.keys()))
-        tile = game.picking_tiles.pop(grid_position)
-        player.hand.append(tile)
-        assigned_positions.append(grid_position)
+    available = game._available_positions
+    needed = min(max(0, 6 - len(player.hand)), len(available))
+    assigned_positions = game._rng.sample(available, needed)
+    for grid_position in assigned_positions:
+        player.add_tile(game.picking_tiles.pop(grid_position))
+        available.remove(grid_position)
+    invalidate_valid_moves(game)
 
     # Check if picking is complete
     if check_picking_complete(game):
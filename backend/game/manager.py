@@ -1,7 +1,30 @@
 """WebSocket connection manager."""
 from fastapi import WebSocket
-from typing import Optional
-import json
+from typing import Awaitable, Callable, Optional
+import asyncio
+import logging
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Max frames waiting to be written to one connection. A client that falls this
+# far behind is disconnected; it gets a fresh full state when it reconnects.
+OUTBOX_SIZE = 64
+
+
+def encode_message(message: dict) -> str:
+    """Encode a message as compact JSON text (the client only handles text frames)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def decode_message(data: str | bytes) -> Optional[dict]:
+    """Decode a client message (text or binary frame), or None if it isn't a JSON object."""
+    try:
+        message = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+    return message if isinstance(message, dict) else None
 
 
 class ConnectionManager:
@@ -10,6 +33,17 @@ class ConnectionManager:
     def __init__(self):
         # game_id -> {player_id -> WebSocket}
         self.connections: dict[str, dict[str, WebSocket]] = {}
+        # Per-connection queue of encoded frames, and the task writing it to the socket
+        self._outboxes: dict[WebSocket, asyncio.Queue[str]] = {}
+        self._relays: dict[WebSocket, asyncio.Task] = {}
+        # Closes and notifications started outside a request; kept so they aren't collected early
+        self._tasks: set[asyncio.Task] = set()
+        # Awaited with (game_id, player_id) when the server drops a player's connection itself
+        self._disconnect_listener: Optional[Callable[[str, str], Awaitable[None]]] = None
+
+    def set_disconnect_listener(self, listener: Optional[Callable[[str, str], Awaitable[None]]]) -> None:
+        """Set the handler run when a connection is dropped by the server (or None to clear it)."""
+        self._disconnect_listener = listener
 
     async def connect(self, websocket: WebSocket, game_id: str, player_id: str):
         """Register a new connection."""
@@ -17,35 +51,119 @@ class ConnectionManager:
         if game_id not in self.connections:
             self.connections[game_id] = {}
         self.connections[game_id][player_id] = websocket
+        outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self._outboxes[websocket] = outbox
+        self._relays[websocket] = asyncio.create_task(
+            self._relay(websocket, outbox, game_id, player_id)
+        )
 
-    def disconnect(self, game_id: str, player_id: str):
-        """Remove a connection."""
-        if game_id in self.connections:
-            self.connections[game_id].pop(player_id, None)
-            if not self.connections[game_id]:
-                del self.connections[game_id]
+    def disconnect(self, game_id: str, player_id: str, websocket: Optional[WebSocket] = None) -> bool:
+        """Remove a connection. If websocket is given, only remove it if it's still the player's current one.
+
+        Returns True if the player's current connection was removed, i.e. the
+        player is now offline and it's up to the caller to handle that.
+        """
+        players = self.connections.get(game_id)
+        if players is None:
+            self._stop_relay(websocket)
+            return False
+        current = players.get(player_id)
+        removed = current is not None and (websocket is None or current is websocket)
+        if removed:
+            del players[player_id]
+        if not players:
+            del self.connections[game_id]
+        # The given socket is done either way; stop writing to it
+        self._stop_relay(websocket if websocket is not None else current)
+        return removed
+
+    def _drop(self, game_id: str, player_id: str, websocket: WebSocket, close_code: Optional[int] = None):
+        """Disconnect a connection the server gave up on, closing it if asked to."""
+        if self.disconnect(game_id, player_id, websocket) and self._disconnect_listener is not None:
+            self._spawn(self._disconnect_listener(game_id, player_id))
+        if close_code is not None:
+            self._spawn(websocket.close(code=close_code))
+
+    def _spawn(self, coro: Awaitable[None]):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Connection task failed: %r", task.exception())
+
+    def _stop_relay(self, websocket: Optional[WebSocket]):
+        self._outboxes.pop(websocket, None)
+        relay = self._relays.pop(websocket, None)
+        if relay is not None and relay is not asyncio.current_task():
+            relay.cancel()
+
+    async def _relay(self, websocket: WebSocket, outbox: asyncio.Queue[str], game_id: str, player_id: str):
+        """Write queued frames to the socket, in order, until it fails or is disconnected."""
+        try:
+            while True:
+                await websocket.send_text(await outbox.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # A failed send means the socket is closed; drop it so later broadcasts skip it
+            self._drop(game_id, player_id, websocket)
+
+    def _enqueue(self, game_id: str, player_id: str, websocket: WebSocket, text: str):
+        """Queue a frame for a connection without waiting on the network."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        try:
+            outbox.put_nowait(text)
+        except asyncio.QueueFull:
+            # Too far behind to catch up frame by frame: drop the connection
+            logger.info("Dropping slow connection %s/%s", game_id, player_id)
+            self._drop(game_id, player_id, websocket, close_code=1013)
 
     async def send_to_player(self, game_id: str, player_id: str, message: dict):
         """Send a message to a specific player."""
-        if game_id in self.connections:
-            ws = self.connections[game_id].get(player_id)
-            if ws:
-                await ws.send_json(message)
+        if self.is_connected(game_id, player_id):
+            await self.send_text_to_player(game_id, player_id, encode_message(message))
+
+    async def send_text_to_player(self, game_id: str, player_id: str, text: str):
+        """Send an already encoded message to a specific player."""
+        ws = self.get_connection(game_id, player_id)
+        if ws:
+            self._enqueue(game_id, player_id, ws, text)
 
     async def broadcast_to_game(self, game_id: str, message: dict, exclude: Optional[str] = None):
-        """Broadcast a message to all players in a game."""
+        """Broadcast a message to all players in a game (encoded once)."""
         if game_id in self.connections:
-            for player_id, ws in self.connections[game_id].items():
-                if player_id != exclude:
-                    try:
-                        await ws.send_json(message)
-                    except Exception:
-                        pass  # Connection might be closed
+            text = encode_message(message)
+            await self.send_texts(game_id, {
+                player_id: text for player_id in self.connections[game_id] if player_id != exclude
+            })
+
+    async def send_texts(self, game_id: str, texts: dict[str, str]):
+        """Send already encoded messages to several players of a game.
+
+        Frames are queued on each connection and written by its relay task,
+        so a slow connection doesn't hold up the caller or the others.
+        """
+        players = self.connections.get(game_id)
+        if not players:
+            return
+        for player_id, text in texts.items():
+            ws = players.get(player_id)
+            if ws is not None:
+                self._enqueue(game_id, player_id, ws, text)
 
     def get_connection(self, game_id: str, player_id: str) -> Optional[WebSocket]:
         """Get a specific connection."""
         return self.connections.get(game_id, {}).get(player_id)
 
+    def connected_player_ids(self, game_id: str) -> set[str]:
+        """IDs of the players with an open connection to a game."""
+        return set(self.connections.get(game_id, ()))
+
     def is_connected(self, game_id: str, player_id: str) -> bool:
         """Check if a player is connected."""
         return self.get_connection(game_id, player_id) is not None
@@ -1,11 +1,22 @@
 """Pydantic models for the domino game."""
+from collections import deque
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field
-from datetime import datetime
+from typing import Callable, Optional
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from datetime import datetime, timezone
+import asyncio
+import random
+import sys
+import time
 import uuid
 
 
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class GameVariant(str, Enum):
     BLOCK = "block"
     DRAW = "draw"
@@ -27,14 +38,21 @@ class GameStatus(str, Enum):
 
 
 class Domino(BaseModel):
-    """A single domino tile."""
+    """A single domino tile. Immutable, so instances can be shared between games."""
+    model_config = ConfigDict(frozen=True)
+
     left: int = Field(ge=0, le=6)
     right: int = Field(ge=0, le=6)
 
     def __hash__(self):
-        return hash((min(self.left, self.right), max(self.left, self.right)))
+        # Orientation-insensitive; pips are 0-6 so this is unique per tile
+        if self.left <= self.right:
+            return self.left * 7 + self.right
+        return self.right * 7 + self.left
 
     def __eq__(self, other):
+        if other is self:
+            return True
         if not isinstance(other, Domino):
             return False
         return (self.left == other.left and self.right == other.right) or \
@@ -46,79 +64,224 @@ class Domino(BaseModel):
     def total(self) -> int:
         return self.left + self.right
 
+    def code(self) -> int:
+        """Pip code for the wire: left * 7 + right (orientation-sensitive, 0-48)."""
+        return self.left * 7 + self.right
+
     def flipped(self) -> "Domino":
-        return Domino(left=self.right, right=self.left)
+        # Swapping two valid pips can't produce an invalid tile, so skip validation
+        return Domino.model_construct(left=self.right, right=self.left)
 
 
-class PlayedDomino(BaseModel):
-    """A domino that has been played on the board."""
+@dataclass(slots=True)
+class PlayedDomino:
+    """A domino that has been played on the board. A plain dataclass, as it is only used internally."""
     domino: Domino
-    position: int  # Position in the chain (0 = first played)
+    position: int  # Play order (0 = first played); chain index is the board index
 
 
 class Player(BaseModel):
     """A player in the game."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: sys.intern(str(uuid.uuid4())))
     name: str
     hand: list[Domino] = Field(default_factory=list)
     score: int = 0
     connected: bool = True
     is_cpu: bool = False
     preferred_avatar: Optional[int] = None  # Player's chosen avatar ID
+    # Number of tiles in hand carrying each pip value (0-6), kept in sync with hand
+    _pip_counts: list[int] = PrivateAttr(default_factory=lambda: [0] * 7)
+    # Tiles in hand, for membership checks
+    _hand_set: set[Domino] = PrivateAttr(default_factory=set)
+    # Sum of pips in hand
+    _hand_total: int = PrivateAttr(default=0)
+    # Hand in wire format, built on demand and dropped whenever the hand changes
+    _hand_view: Optional[list[int]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        self.set_hand(self.hand)
+
+    def set_hand(self, tiles: list[Domino]) -> None:
+        """Replace the whole hand."""
+        self.hand = tiles
+        self._hand_view = None
+        self._hand_set = set(tiles)
+        self._hand_total = sum(d.total() for d in tiles)
+        self._pip_counts = [0] * 7
+        for domino in tiles:
+            self._count_pips(domino, 1)
+
+    def add_tile(self, domino: Domino) -> None:
+        """Add a tile to the hand."""
+        self.hand.append(domino)
+        self._hand_view = None
+        self._hand_set.add(domino)
+        self._hand_total += domino.total()
+        self._count_pips(domino, 1)
+
+    def remove_tile(self, domino: Domino) -> None:
+        """Remove a tile from the hand (either orientation)."""
+        self.hand.remove(domino)
+        self._hand_view = None
+        self._hand_set.discard(domino)
+        self._hand_total -= domino.total()
+        self._count_pips(domino, -1)
+
+    def has_tile(self, domino: Domino) -> bool:
+        """Check if the tile is in hand (either orientation)."""
+        return domino in self._hand_set
+
+    def _count_pips(self, domino: Domino, delta: int) -> None:
+        self._pip_counts[domino.left] += delta
+        if domino.right != domino.left:
+            self._pip_counts[domino.right] += delta
+
+    def pip_count(self, value: int) -> int:
+        """Number of tiles in hand that carry the given pip value."""
+        return self._pip_counts[value]
 
     def hand_total(self) -> int:
-        return sum(d.total() for d in self.hand)
+        return self._hand_total
+
+    def hand_view(self) -> list[int]:
+        """The hand as a list of pip codes, cached until the hand changes."""
+        if self._hand_view is None:
+            self._hand_view = [d.code() for d in self.hand]
+        return self._hand_view
 
 
-class BoardEnds(BaseModel):
-    """The current playable ends of the board."""
+@dataclass(slots=True)
+class BoardEnds:
+    """The current playable ends of the board. Read on every move, so a plain slotted dataclass."""
     left: Optional[int] = None
     right: Optional[int] = None
 
 
 class Game(BaseModel):
     """The complete game state."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = Field(default_factory=lambda: sys.intern(str(uuid.uuid4())[:8]))
     variant: GameVariant = GameVariant.BLOCK
     status: GameStatus = GameStatus.WAITING
     players: list[Player] = Field(default_factory=list)
     current_turn: Optional[str] = None  # player_id
-    board: list[PlayedDomino] = Field(default_factory=list)
+    board: deque[PlayedDomino] = Field(default_factory=deque)  # Left end first
     boneyard: list[Domino] = Field(default_factory=list)
     ends: BoardEnds = Field(default_factory=BoardEnds)
     max_players: int = 4
     winner_id: Optional[str] = None
+    was_blocked: bool = False  # Round ended with nobody able to play (set with winner_id)
     round_number: int = 1
     match_id: Optional[str] = None  # Link to parent match for multi-round play
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
-    turn_started_at: Optional[datetime] = None  # When current turn started (for timer)
+    creator_id: Optional[str] = None  # First player seated; only they can add CPUs and start early/next rounds
+    created_at: datetime = Field(default_factory=utc_now)
+    last_activity: float = Field(default_factory=time.monotonic)  # time.monotonic() of the last action
+    turn_started_at: Optional[datetime] = None  # When current turn started (wall clock, sent to clients)
     turn_timeout: int = 30  # Seconds before auto-play (0 = disabled)
     # Tile picking phase fields
     picking_tiles: dict[int, Domino] = Field(default_factory=dict)  # Grid position (0-27) -> tile
+    _available_positions: list[int] = PrivateAttr(default_factory=list)  # Keys of picking_tiles, for sampling
     picking_started_at: datetime | None = None  # For picking timeout
     picking_timeout: int = 60  # Seconds before auto-assign remaining tiles
     cpu_speed: CpuSpeed = CpuSpeed.NORMAL  # How fast CPU players play
+    # Valid moves per player, valid while board/ends are unchanged (see logic.get_valid_moves)
+    _valid_moves_key: int = PrivateAttr(default=-1)
+    _valid_moves_cache: dict[str, list[tuple[Domino, str]]] = PrivateAttr(default_factory=dict)
+    # Seat index by player id, names in use and human players, kept in sync by add_player
+    _player_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    _names: set[str] = PrivateAttr(default_factory=set)
+    _humans: list[Player] = PrivateAttr(default_factory=list)
+    # time.monotonic() when the current turn started, set with turn_started_at
+    _turn_started_mono: float = PrivateAttr(default=0.0)
+    _picking_started_mono: float = PrivateAttr(default=0.0)
+    # Held while a task claims tiles for the CPU players, so only one runs per game
+    _cpu_picking_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+    # Random source for shuffles and CPU choices in this game (seed it to replay a game)
+    _rng: random.Random = PrivateAttr(default_factory=random.Random)
+    # Called after every set_status (the room manager uses it to track expiry)
+    _status_listener: Optional[Callable[["Game"], None]] = PrivateAttr(default=None)
+    # Called when the turn timer starts or is cleared / the picking timer starts
+    # (the room manager queues or drops the deadline)
+    _turn_timer_listener: Optional[Callable[["Game"], None]] = PrivateAttr(default=None)
+    _picking_timer_listener: Optional[Callable[["Game"], None]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        self._player_index = {p.id: i for i, p in enumerate(self.players)}
+        self._names = {p.name for p in self.players}
+        self._humans = [p for p in self.players if not p.is_cpu]
+        if self.creator_id is None and self.players:
+            self.creator_id = self.players[0].id
 
     def touch(self):
         """Update last activity timestamp."""
-        self.last_activity = datetime.utcnow()
+        self.last_activity = time.monotonic()
+
+    def set_status(self, status: GameStatus) -> None:
+        """Change the game status and notify the status listener."""
+        self.status = status
+        if self._status_listener is not None:
+            self._status_listener(self)
+
+    def start_turn_timer(self, now: Optional[datetime] = None) -> None:
+        """Start the timer for the current turn."""
+        self.turn_started_at = now or utc_now()
+        self._turn_started_mono = time.monotonic()
+        if self._turn_timer_listener is not None:
+            self._turn_timer_listener(self)
+
+    def clear_turn_timer(self) -> None:
+        """Stop the turn timer, for phases without a running turn."""
+        self.turn_started_at = None
+        if self._turn_timer_listener is not None:
+            self._turn_timer_listener(self)
+
+    def turn_elapsed(self) -> float:
+        """Seconds since the current turn started. Uses the monotonic clock, so wall clock jumps don't matter."""
+        return time.monotonic() - self._turn_started_mono
+
+    def turn_deadline(self) -> float:
+        """Monotonic time at which the current turn times out."""
+        return self._turn_started_mono + self.turn_timeout
+
+    def start_picking_timer(self, now: Optional[datetime] = None) -> None:
+        """Start the timer for the picking phase."""
+        self.picking_started_at = now or utc_now()
+        self._picking_started_mono = time.monotonic()
+        if self._picking_timer_listener is not None:
+            self._picking_timer_listener(self)
+
+    def picking_elapsed(self) -> float:
+        """Seconds since the picking phase started, on the monotonic clock."""
+        return time.monotonic() - self._picking_started_mono
+
+    def picking_deadline(self) -> float:
+        """Monotonic time at which the picking phase times out."""
+        return self._picking_started_mono + self.picking_timeout
 
     def has_connected_humans(self) -> bool:
         """Check if any human players are connected."""
-        return any(p.connected and not p.is_cpu for p in self.players)
+        return any(p.connected for p in self._humans)
+
+    def add_player(self, player: Player) -> None:
+        """Seat a player at the next position."""
+        if self.creator_id is None:
+            self.creator_id = player.id
+        self._player_index[player.id] = len(self.players)
+        self._names.add(player.name)
+        if not player.is_cpu:
+            self._humans.append(player)
+        self.players.append(player)
+
+    @property
+    def taken_names(self) -> set[str]:
+        """Names of the seated players. Must not be mutated."""
+        return self._names
 
     def get_player(self, player_id: str) -> Optional[Player]:
-        for p in self.players:
-            if p.id == player_id:
-                return p
-        return None
+        index = self._player_index.get(player_id)
+        return self.players[index] if index is not None else None
 
     def get_player_index(self, player_id: str) -> int:
-        for i, p in enumerate(self.players):
-            if p.id == player_id:
-                return i
-        return -1
+        return self._player_index.get(player_id, -1)
 
 
 # WebSocket message models
@@ -174,10 +337,21 @@ class RoundResult(BaseModel):
     remaining_pips: dict[str, int]  # player_id -> remaining pip count
     was_blocked: bool = False
 
+    def to_dict(self) -> dict:
+        """Serializable form sent to the frontend."""
+        return {
+            "round_number": self.round_number,
+            "winner_id": self.winner_id,
+            "winner_team": self.winner_team,
+            "points_awarded": self.points_awarded,
+            "remaining_pips": self.remaining_pips,
+            "was_blocked": self.was_blocked
+        }
+
 
 class Match(BaseModel):
     """A match consisting of multiple rounds."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = Field(default_factory=lambda: sys.intern(str(uuid.uuid4())[:8]))
     current_game: Optional[Game] = None
     completed_rounds: list[RoundResult] = Field(default_factory=list)
 
@@ -186,6 +360,12 @@ class Match(BaseModel):
     team_b: list[str] = Field(default_factory=list)
     team_a_name: str = "Team A"  # Randomly assigned monkey/ape species
     team_b_name: str = "Team B"
+    # player_id -> "team_a"/"team_b", kept in sync by set_teams
+    _team_of: dict[str, str] = PrivateAttr(default_factory=dict)
+    # Serialized completed_rounds (rounds never change once added), kept in sync by add_round
+    _rounds_view: list[dict] = PrivateAttr(default_factory=list)
+    # Bumped by mark_changed whenever anything in the match state changes
+    _revision: int = PrivateAttr(default=0)
 
     # Scoring
     is_team_game: bool = False
@@ -198,12 +378,48 @@ class Match(BaseModel):
     player_positions: list[str] = Field(default_factory=list)  # ordered player ids (seat positions)
     avatar_ids: list[int] = Field(default_factory=list)  # avatar IDs for positions 0-3 (randomly selected from 1-20)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    last_activity: datetime = Field(default_factory=utc_now)
+
+    def model_post_init(self, __context) -> None:
+        self.set_teams(self.team_a, self.team_b)
+        self._rounds_view = [r.to_dict() for r in self.completed_rounds]
 
     def touch(self):
         """Update last activity timestamp."""
-        self.last_activity = datetime.utcnow()
+        self.last_activity = utc_now()
+
+    def set_teams(self, team_a: list[str], team_b: list[str]) -> None:
+        """Assign the two teams."""
+        self.team_a = team_a
+        self.team_b = team_b
+        self._team_of = {pid: "team_a" for pid in team_a}
+        self._team_of.update((pid, "team_b") for pid in team_b)
+        self.mark_changed()
+
+    def mark_changed(self) -> None:
+        """Note that the match state changed, so cached views of it are stale."""
+        self._revision += 1
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def add_round(self, result: RoundResult) -> None:
+        """Record a completed round."""
+        self.completed_rounds.append(result)
+        self._rounds_view.append(result.to_dict())
+        self.mark_changed()
+
+    @property
+    def rounds_view(self) -> list[dict]:
+        """Completed rounds as sent to the frontend. Must not be mutated."""
+        return self._rounds_view
+
+    @property
+    def team_of(self) -> dict[str, str]:
+        """Team of each player, by player_id. Must not be mutated."""
+        return self._team_of
 
     def get_current_scores(self) -> dict:
         """Get current scores based on game type."""
@@ -229,8 +445,4 @@ class Match(BaseModel):
 
     def get_team_for_player(self, player_id: str) -> Optional[str]:
         """Get which team a player is on."""
-        if player_id in self.team_a:
-            return "team_a"
-        if player_id in self.team_b:
-            return "team_b"
-        return None
+        return self._team_of.get(player_id)
@@ -1,7 +1,11 @@
 """Game room management."""
+import heapq
 import random
-from typing import Optional
-from datetime import datetime, timedelta
+import sys
+import time
+import uuid
+from itertools import islice
+from typing import Callable, Optional
 from .models import (
     Game, Player, GameStatus, GameVariant, CreateGameRequest, CpuSpeed,
     Match, RoundResult, TeamScores, IndividualScores
@@ -9,18 +13,139 @@ from .models import (
 from .logic import start_game, calculate_round_points, calculate_team_round_points, start_new_round
 from .cpu import create_cpu_player, MONKEY_SPECIES
 
-# Cleanup timeouts
-WAITING_TIMEOUT = timedelta(minutes=30)  # Remove waiting games after 30 min with no humans
-FINISHED_TIMEOUT = timedelta(minutes=5)  # Remove finished games after 5 min
-INACTIVE_TIMEOUT = timedelta(minutes=60)  # Remove any game inactive for 1 hour
+# Cleanup timeouts, in seconds (compared against monotonic last_activity)
+FINISHED_TIMEOUT = 5 * 60.0  # Remove finished games after 5 min
+INACTIVE_TIMEOUT = 60 * 60.0  # Remove any game inactive for 1 hour
+WAITING_NO_HUMANS_TIMEOUT = 2 * 60.0  # Remove waiting games left without humans
+EXPIRY_RECHECK = 60.0  # Recheck interval for games past their deadline but still in use
+
+# Avatar IDs that can be assigned to players
+AVATAR_IDS: tuple[int, ...] = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 14, 15, 16, 17, 18, 20)
+
+
+class GameStore:
+    """In-memory games by ID.
+
+    Games are only touched from the event loop and no method here awaits, so
+    every call, including the check-and-act ones, completes without another
+    task interleaving. No lock is needed.
+    """
+
+    def __init__(self):
+        self._games: dict[str, Game] = {}
+        # Games partitioned by status (insertion ordered), kept in sync by update_status
+        self._by_status: dict[GameStatus, dict[str, Game]] = {status: {} for status in GameStatus}
+        self._status_of: dict[str, GameStatus] = {}
+
+    def get(self, game_id: str) -> Optional[Game]:
+        return self._games.get(game_id)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def values(self) -> list[Game]:
+        """Snapshot of all games, safe to iterate while games are added or removed."""
+        return list(self._games.values())
+
+    def with_status(self, status: GameStatus, limit: Optional[int] = None) -> list[Game]:
+        """Snapshot of the games with the given status, oldest first, up to limit games."""
+        return list(islice(self._by_status[status].values(), limit))
+
+    def count(self, status: GameStatus) -> int:
+        """Number of games with the given status."""
+        return len(self._by_status[status])
+
+    def update_status(self, game: Game) -> None:
+        """Move a game to the partition of its current status."""
+        old_status = self._status_of.get(game.id)
+        if old_status is None or old_status == game.status:
+            return
+        del self._by_status[old_status][game.id]
+        self._by_status[game.status][game.id] = game
+        self._status_of[game.id] = game.status
+
+    def try_insert(self, game: Game) -> bool:
+        """Add a game. Returns False if its ID is already taken."""
+        if game.id in self._games:
+            return False
+        self._games[game.id] = game
+        self._by_status[game.status][game.id] = game
+        self._status_of[game.id] = game.status
+        return True
+
+    def remove(self, game_id: str) -> Optional[Game]:
+        """Remove a game if it exists. Returns the removed game."""
+        game = self._games.pop(game_id, None)
+        if game is not None:
+            del self._by_status[self._status_of.pop(game_id)][game_id]
+        return game
+
+    def try_remove_if(self, game_id: str, predicate: Callable[[Game], bool]) -> Optional[Game]:
+        """Remove a game if it exists and the predicate holds for it. Returns the removed game."""
+        game = self._games.get(game_id)
+        if game is None or not predicate(game):
+            return None
+        return self.remove(game_id)
+
+
+class DeadlineQueue:
+    """Min-heap of (deadline, game_id) holding at most one live deadline per game.
+
+    Rescheduling or cancelling doesn't touch the heap; entries whose deadline no
+    longer matches the live one were superseded and are skipped when popped.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+
+    def schedule(self, game_id: str, deadline: float) -> None:
+        """Set (or replace) the deadline for a game."""
+        self._deadlines[game_id] = deadline
+        heapq.heappush(self._heap, (deadline, game_id))
+
+    def cancel(self, game_id: str) -> None:
+        """Drop the deadline for a game, if any."""
+        self._deadlines.pop(game_id, None)
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest live deadline, or None if nothing is scheduled."""
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> list[str]:
+        """Remove and return the games whose live deadline is at or before now."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, game_id = heapq.heappop(heap)
+            if self._deadlines.get(game_id) == deadline:
+                del self._deadlines[game_id]
+                due.append(game_id)
+        return due
 
 
 class GameRoomManager:
     """Manages game rooms in memory."""
 
     def __init__(self):
-        self.games: dict[str, Game] = {}
+        self.games = GameStore()
         self.matches: dict[str, Match] = {}
+        # match_id -> (revision, state) from get_match_state
+        self._match_states: dict[str, tuple[int, dict]] = {}
+        # Bumped whenever the open game listing may have changed
+        self._lobby_revision = 0
+        # Monotonic deadlines: next cleanup check, turn timeout and picking timeout per game
+        self._expiry = DeadlineQueue()
+        self._turn_deadlines = DeadlineQueue()
+        self._picking_deadlines = DeadlineQueue()
+        # Called with each newly queued deadline, so a sleeping scheduler can wake up for it
+        self._deadline_listener: Optional[Callable[[float], None]] = None
 
     def create_game(self, request: CreateGameRequest) -> tuple[Game, Player]:
         """Create a new game and add the creator as first player."""
@@ -31,16 +156,20 @@ class GameRoomManager:
         )
 
         player = Player(name=request.player_name, preferred_avatar=request.avatar_id)
-        game.players.append(player)
+        game.add_player(player)
 
         # Add CPU players
         cpu_count = min(request.cpu_players, request.max_players - 1)
-        for i in range(cpu_count):
-            existing_names = [p.name for p in game.players]
-            cpu_player = create_cpu_player(i, existing_names)
-            game.players.append(cpu_player)
-
-        self.games[game.id] = game
+        for _ in range(cpu_count):
+            game.add_player(create_cpu_player(game.taken_names))
+
+        while not self.games.try_insert(game):
+            game.id = sys.intern(str(uuid.uuid4())[:8])  # Short IDs can collide
+        game._status_listener = self._on_status_change
+        game._turn_timer_listener = self._on_turn_timer_change
+        game._picking_timer_listener = self._on_picking_timer_start
+        self._schedule_expiry(game)
+        self._lobby_revision += 1
         return game, player
 
     def get_game(self, game_id: str) -> Optional[Game]:
@@ -63,11 +192,12 @@ class GameRoomManager:
             return None, None, "Game is full"
 
         # Check if name is already taken
-        if any(p.name == player_name for p in game.players):
+        if player_name in game.taken_names:
             return None, None, "Name already taken in this game"
 
         player = Player(name=player_name, preferred_avatar=avatar_id)
-        game.players.append(player)
+        game.add_player(player)
+        self._lobby_revision += 1
 
         # Auto-start when enough players (minimum 2)
         if len(game.players) >= 2 and len(game.players) == game.max_players:
@@ -89,16 +219,15 @@ class GameRoomManager:
             return False, "Game has already started", False
 
         # Only the first player (creator) can add CPUs
-        if not game.players or game.players[0].id != player_id:
+        if game.creator_id != player_id:
             return False, "Only the game creator can add CPU players", False
 
         if len(game.players) >= game.max_players:
             return False, "Game is full", False
 
-        # Get existing names to avoid duplicates
-        existing_names = [p.name for p in game.players]
-        cpu_player = create_cpu_player(existing_names=existing_names)
-        game.players.append(cpu_player)
+        # Avoid names already in use
+        game.add_player(create_cpu_player(game.taken_names))
+        self._lobby_revision += 1
 
         # Auto-start if full
         game_started = False
@@ -119,7 +248,7 @@ class GameRoomManager:
             return False, "Game has already started"
 
         # Only the first player (creator) can start early
-        if not game.players or game.players[0].id != player_id:
+        if game.creator_id != player_id:
             return False, "Only the game creator can start early"
 
         if len(game.players) < 2:
@@ -155,67 +284,160 @@ class GameRoomManager:
             return player
         return None
 
-    def delete_game(self, game_id: str) -> bool:
-        """Delete a game."""
-        if game_id in self.games:
-            del self.games[game_id]
-            return True
-        return False
+    def delete_game(self, game_id: str, only_if: Optional[Callable[[Game], bool]] = None) -> bool:
+        """Delete a game, optionally only if only_if(game) holds at that point."""
+        if only_if is None:
+            removed = self.games.remove(game_id)
+        else:
+            removed = self.games.try_remove_if(game_id, only_if)
+        if removed is None:
+            return False
+        self._expiry.cancel(game_id)
+        self._turn_deadlines.cancel(game_id)
+        self._picking_deadlines.cancel(game_id)
+        if removed.match_id is not None:
+            # The match only lives as long as its game
+            self.matches.pop(removed.match_id, None)
+            self._match_states.pop(removed.match_id, None)
+        self._lobby_revision += 1
+        return True
+
+    def list_open_games(self, limit: Optional[int] = None) -> list[Game]:
+        """List games that are waiting for players (all, or the first limit)."""
+        return self.games.with_status(GameStatus.WAITING, limit)
+
+    @property
+    def lobby_revision(self) -> int:
+        """Changes whenever list_open_games may return something different."""
+        return self._lobby_revision
 
-    def list_open_games(self) -> list[Game]:
-        """List all games that are waiting for players."""
-        return [g for g in self.games.values() if g.status == GameStatus.WAITING]
+    def list_active_games(self, limit: Optional[int] = None) -> list[Game]:
+        """List games that are currently being played (all, or the first limit)."""
+        return self.games.with_status(GameStatus.PLAYING, limit)
 
-    def list_active_games(self) -> list[Game]:
-        """List all games that are currently being played."""
-        return [g for g in self.games.values() if g.status == GameStatus.PLAYING]
+    def list_picking_games(self) -> list[Game]:
+        """List all games in the tile picking phase."""
+        return self.games.with_status(GameStatus.PICKING)
 
-    def cleanup_stale_games(self) -> tuple[int, list[str]]:
+    def cleanup_stale_games(self) -> tuple[int, list[tuple[str, str]]]:
         """
         Remove stale games based on various conditions.
-        Returns (count_removed, list_of_removed_ids).
+        Returns (count_removed, list of (game_id, reason)).
         """
-        now = datetime.utcnow()
-        to_remove = []
-        reasons = []
+        now = time.monotonic()
+        reasons: list[tuple[str, str]] = []
 
-        for game_id, game in self.games.items():
-            reason = None
+        # Only games whose earliest possible expiry has passed are looked at
+        for game_id in self._expiry.pop_due(now):
+            game = self.games.get(game_id)
+            reason = self._stale_reason(game, now)
+            if reason:
+                self.delete_game(game_id)
+                reasons.append((game_id, reason))
+            else:
+                self._schedule_expiry(game, now)
+
+        return len(reasons), reasons
+
+    def _stale_reason(self, game: Game, now: float) -> Optional[str]:
+        """Why the game should be removed now, or None to keep it."""
+        # Any game inactive for too long
+        if now - game.last_activity > INACTIVE_TIMEOUT:
+            return "inactive"
+
+        # Waiting games with no connected humans
+        if game.status == GameStatus.WAITING:
+            if not game.has_connected_humans():
+                if now - game.last_activity > WAITING_NO_HUMANS_TIMEOUT:
+                    return "waiting_no_humans"
+
+        # Finished games after timeout
+        elif game.status == GameStatus.FINISHED:
+            if now - game.last_activity > FINISHED_TIMEOUT:
+                return "finished"
 
-            # Any game inactive for too long
-            if now - game.last_activity > INACTIVE_TIMEOUT:
-                reason = "inactive"
+        return None
 
-            # Waiting games with no connected humans
-            elif game.status == GameStatus.WAITING:
-                if not game.has_connected_humans():
-                    if now - game.last_activity > timedelta(minutes=2):
-                        reason = "waiting_no_humans"
+    def _on_status_change(self, game: Game) -> None:
+        """Status listener for managed games: update the status index and cleanup schedule."""
+        self.games.update_status(game)
+        self._schedule_expiry(game)
+        self._lobby_revision += 1
 
-            # Finished games after timeout
-            elif game.status == GameStatus.FINISHED:
-                if now - game.last_activity > FINISHED_TIMEOUT:
-                    reason = "finished"
+    def _schedule_expiry(self, game: Game, now: Optional[float] = None) -> None:
+        """(Re)schedule the cleanup check for a game, based on its status and last activity."""
+        if game.id not in self.games:
+            return
 
-            if reason:
-                to_remove.append(game_id)
-                reasons.append(f"{game_id}:{reason}")
+        if game.status == GameStatus.WAITING:
+            timeout = WAITING_NO_HUMANS_TIMEOUT
+        elif game.status == GameStatus.FINISHED:
+            timeout = FINISHED_TIMEOUT
+        else:
+            timeout = INACTIVE_TIMEOUT
+        deadline = game.last_activity + timeout
+        if now is not None and deadline <= now:
+            # Past the deadline but still in use (e.g. humans in the lobby)
+            deadline = now + EXPIRY_RECHECK
 
-        for game_id in to_remove:
-            del self.games[game_id]
+        self._queue_deadline(self._expiry, game.id, deadline)
 
-        return len(to_remove), reasons
+    def _on_turn_timer_change(self, game: Game) -> None:
+        """Turn timer listener for managed games: queue the turn's timeout, or drop it once cleared."""
+        if game.id not in self.games:
+            return
+        if game.turn_started_at is None or game.turn_timeout <= 0:
+            self._turn_deadlines.cancel(game.id)
+        else:
+            self._queue_deadline(self._turn_deadlines, game.id, game.turn_deadline())
+
+    def _on_picking_timer_start(self, game: Game) -> None:
+        """Picking timer listener for managed games: queue the picking timeout."""
+        if game.id in self.games:
+            self._queue_deadline(self._picking_deadlines, game.id, game.picking_deadline())
+
+    def _queue_deadline(self, queue: DeadlineQueue, game_id: str, deadline: float) -> None:
+        """Schedule a deadline and let the deadline listener know about it."""
+        queue.schedule(game_id, deadline)
+        if self._deadline_listener is not None:
+            self._deadline_listener(deadline)
+
+    def set_deadline_listener(self, listener: Optional[Callable[[float], None]]) -> None:
+        """Set the callback told about every newly queued deadline (or None to clear it)."""
+        self._deadline_listener = listener
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest queued cleanup check, turn or picking timeout (monotonic), or None."""
+        deadlines = [d for d in (self._expiry.next_deadline(),
+                                 self._turn_deadlines.next_deadline(),
+                                 self._picking_deadlines.next_deadline()) if d is not None]
+        return min(deadlines, default=None)
+
+    def pop_turn_timeouts(self, now: float) -> list[Game]:
+        """Games whose current turn has timed out by now (each returned once per turn)."""
+        games = []
+        for game_id in self._turn_deadlines.pop_due(now):
+            game = self.games.get(game_id)
+            if game is not None and game.status == GameStatus.PLAYING:
+                games.append(game)
+        return games
+
+    def pop_picking_timeouts(self, now: float) -> list[Game]:
+        """Games whose picking phase has timed out by now."""
+        games = []
+        for game_id in self._picking_deadlines.pop_due(now):
+            game = self.games.get(game_id)
+            if game is not None and game.status == GameStatus.PICKING:
+                games.append(game)
+        return games
 
     def get_stats(self) -> dict:
         """Get statistics about current games."""
-        waiting = sum(1 for g in self.games.values() if g.status == GameStatus.WAITING)
-        playing = sum(1 for g in self.games.values() if g.status == GameStatus.PLAYING)
-        finished = sum(1 for g in self.games.values() if g.status == GameStatus.FINISHED)
         return {
             "total": len(self.games),
-            "waiting": waiting,
-            "playing": playing,
-            "finished": finished
+            "waiting": self.games.count(GameStatus.WAITING),
+            "playing": self.games.count(GameStatus.PLAYING),
+            "finished": self.games.count(GameStatus.FINISHED)
         }
 
 
@@ -241,6 +463,7 @@ class GameRoomManager:
         # Store match reference in game
         game.match_id = match.id
         self.matches[match.id] = match
+        match.mark_changed()
         return match
 
     def finalize_match_teams(self, game: Game) -> None:
@@ -252,42 +475,46 @@ class GameRoomManager:
         if not match:
             return
 
-        # Update player info for any new players that joined after match creation
+        # Update player info for any new players that joined after match creation,
+        # collecting bot names for the team name draw on the way
+        bot_names: set[str] = set()
         for player in game.players:
             if player.id not in match.player_names:
                 match.player_names[player.id] = player.name
                 match.player_positions.append(player.id)
                 match.individual_scores.scores[player.id] = 0
+            if player.is_cpu:
+                bot_names.add(player.name)
 
         # Assign avatars: respect player preferences, randomly fill the rest
         if not match.avatar_ids:
-            available_avatars = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 14, 15, 16, 17, 18, 20]
             match.avatar_ids = [None] * len(game.players)
             used_avatars = set()
 
             # First pass: assign preferred avatars
             for i, player in enumerate(game.players):
-                if player.preferred_avatar and player.preferred_avatar in available_avatars:
+                if player.preferred_avatar and player.preferred_avatar in AVATAR_IDS:
                     if player.preferred_avatar not in used_avatars:
                         match.avatar_ids[i] = player.preferred_avatar
                         used_avatars.add(player.preferred_avatar)
 
             # Second pass: randomly assign remaining
-            remaining = [a for a in available_avatars if a not in used_avatars]
-            random.shuffle(remaining)
+            remaining = [a for a in AVATAR_IDS if a not in used_avatars]
+            picks = iter(random.sample(remaining, match.avatar_ids.count(None)))
             for i in range(len(match.avatar_ids)):
                 if match.avatar_ids[i] is None:
-                    match.avatar_ids[i] = remaining.pop()
+                    match.avatar_ids[i] = next(picks)
 
         # Set up teams for 4 players
         if len(game.players) == 4:
             match.is_team_game = True
             # Opposite seats are teammates: 0+2 vs 1+3
-            match.team_a = [game.players[0].id, game.players[2].id]
-            match.team_b = [game.players[1].id, game.players[3].id]
+            match.set_teams(
+                [game.players[0].id, game.players[2].id],
+                [game.players[1].id, game.players[3].id],
+            )
 
             # Randomly select team names (exclude bot names to avoid confusion)
-            bot_names = [p.name for p in game.players if p.is_cpu]
             available_names = [n for n in MONKEY_SPECIES if n not in bot_names]
             if len(available_names) >= 2:
                 team_names = random.sample(available_names, 2)
@@ -297,18 +524,20 @@ class GameRoomManager:
             # Clear individual scores since we're using team scores
             match.individual_scores.scores.clear()
 
+        match.mark_changed()
+
     def get_match(self, match_id: str) -> Optional[Match]:
         """Get a match by ID."""
         return self.matches.get(match_id)
 
     def get_match_for_game(self, game_id: str) -> Optional[Match]:
         """Get the match that contains a game."""
-        game = self.get_game(game_id)
-        if game and hasattr(game, 'match_id') and game.match_id:
+        game = self.games.get(game_id)
+        if game is not None and game.match_id is not None:
             return self.matches.get(game.match_id)
         return None
 
-    def complete_round(self, match: Match) -> RoundResult:
+    def complete_round(self, match: Match) -> Optional[RoundResult]:
         """
         Process end of round, calculate scores, return result.
         """
@@ -318,12 +547,12 @@ class GameRoomManager:
 
         round_number = len(match.completed_rounds) + 1
 
-        # Check if game was blocked (all players have tiles)
-        was_blocked = all(len(p.hand) > 0 for p in game.players)
+        # Recorded by check_game_over when the round ended
+        was_blocked = game.was_blocked
 
         if match.is_team_game:
             winning_team, points, remaining_pips = calculate_team_round_points(
-                game, match.team_a, match.team_b
+                game, match.team_of
             )
 
             # Update team scores
@@ -357,7 +586,7 @@ class GameRoomManager:
                 was_blocked=was_blocked
             )
 
-        match.completed_rounds.append(result)
+        match.add_round(result)
         match.touch()
         return result
 
@@ -386,12 +615,22 @@ class GameRoomManager:
         # Start the game - previous round winner starts
         start_game(game, starting_player_id=previous_winner_id)
         match.touch()
+        match.mark_changed()
         return True
 
     def get_match_state(self, match: Match) -> dict:
-        """Get serializable match state for frontend."""
-        return {
+        """Get serializable match state for frontend.
+
+        Built once per match revision and shared by every view until the match
+        changes, so it must not be mutated.
+        """
+        cached = self._match_states.get(match.id)
+        if cached is not None and cached[0] == match.revision:
+            return cached[1]
+
+        state = {
             "id": match.id,
+            "revision": match.revision,
             "is_team_game": match.is_team_game,
             "target_score": match.target_score,
             "current_round": len(match.completed_rounds) + 1,
@@ -403,19 +642,11 @@ class GameRoomManager:
             "player_positions": match.player_positions,
             "player_names": match.player_names,
             "avatar_ids": match.avatar_ids,  # Randomly selected avatars for positions 0-3
-            "completed_rounds": [
-                {
-                    "round_number": r.round_number,
-                    "winner_id": r.winner_id,
-                    "winner_team": r.winner_team,
-                    "points_awarded": r.points_awarded,
-                    "remaining_pips": r.remaining_pips,
-                    "was_blocked": r.was_blocked
-                }
-                for r in match.completed_rounds
-            ],
+            "completed_rounds": match.rounds_view,
             "match_winner": match.get_winner()
         }
+        self._match_states[match.id] = (match.revision, state)
+        return state
 
 
 # Global room manager instance
@@ -1,27 +1,48 @@
 """FastAPI application for multiplayer dominoes."""
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
-from datetime import datetime
+from typing import Optional
 import json
 import os
+import sys
 
 from game.models import (
-    Game, CreateGameRequest, JoinGameRequest, PlayTileRequest,
-    Domino, GameStatus, Match, CpuSpeed
+    Game, Player, CreateGameRequest, JoinGameRequest, PlayTileRequest,
+    GameStatus, Match, CpuSpeed, utc_now
 )
-from game.logic import play_tile, pass_turn, start_game, get_valid_moves, has_valid_move, claim_tile, cpu_claim_tile, check_picking_complete, auto_assign_remaining_tiles
-from game.manager import manager
+from game.logic import ORIENTED_DOMINOES, get_domino, play_tile, pass_turn, start_game, get_valid_moves, has_valid_move, claim_tile, cpu_claim_tile, check_picking_complete, auto_assign_remaining_tiles
+from game.manager import manager, encode_message, decode_message
 from game.rooms import room_manager
 from game.cpu import is_cpu_turn, execute_cpu_turn
 import asyncio
-import random
 import time
 
-# Track games with active CPU picking tasks to prevent concurrent task spawning
-_cpu_picking_active: set[str] = set()
+# Pending CPU move per game, so each game has at most one scheduled
+_cpu_turn_timers: dict[str, asyncio.TimerHandle] = {}
+# Tasks started from timers and handlers without awaiting them, kept until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background, keeping a reference and logging its failure."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+    return task
+
+
+def _background_task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background task error: {task.exception()!r}")
+
+# Wire format of every tile in both orientations, built once and shared by all messages
+DOMINO_VIEWS: dict[tuple[int, int], dict] = {
+    pair: {"left": pair[0], "right": pair[1]} for pair in ORIENTED_DOMINOES
+}
 
 # Test mode - set TEST_MODE=1 to make CPUs pick instantly
 TEST_MODE = os.environ.get("TEST_MODE", "0") == "1"
@@ -47,34 +68,98 @@ def get_cpu_pick_delay_range(cpu_speed: CpuSpeed) -> tuple[float, float]:
     }.get(cpu_speed, (1.5, 3.0))
 
 
-async def cleanup_task():
-    """Background task to periodically clean up stale games."""
-    while True:
-        await asyncio.sleep(60)  # Run every minute
-        try:
-            count, reasons = room_manager.cleanup_stale_games()
-            if count > 0:
-                print(f"Cleaned up {count} stale games: {reasons}")
-        except Exception as e:
-            print(f"Cleanup error: {e}")
+# Longest the background scheduler sleeps, in seconds. It's woken up for newly
+# queued deadlines, so this is only a safety net.
+SCHEDULER_MAX_SLEEP = 10 * 60.0
 
 
-async def picking_timer_task():
-    """Background task to check for picking phase timeouts."""
-    while True:
-        await asyncio.sleep(5)  # Check every 5 seconds
-        try:
-            for game in room_manager.list_active_games():
-                if game.status != GameStatus.PICKING:
-                    continue
-                if not game.picking_started_at:
-                    continue
-
-                elapsed = (datetime.utcnow() - game.picking_started_at).total_seconds()
-                if elapsed >= game.picking_timeout:
-                    await handle_picking_timeout(game.id)
-        except Exception as e:
-            print(f"Picking timer error: {e}")
+async def scheduler_task(shutdown: asyncio.Event):
+    """Background task for stale game cleanup and turn / picking timeouts.
+
+    Sleeps until the earliest queued deadline (cleanup check or timeout) and
+    handles whatever is due. The room manager wakes it up whenever a deadline
+    earlier than the one it sleeps towards is queued, so an idle server
+    doesn't poll. Timeout handlers run as their own tasks, since they may go
+    on to play out CPU turns. Returns once shutdown is set.
+    """
+    wakeup = asyncio.Event()
+    wake_at = 0.0
+
+    def on_deadline(deadline: float):
+        if deadline < wake_at:
+            wakeup.set()
+
+    room_manager.set_deadline_listener(on_deadline)
+    shutdown_wait = asyncio.ensure_future(shutdown.wait())
+    wakeup_wait = None
+    try:
+        while True:
+            now = time.monotonic()
+            wake_at = now + SCHEDULER_MAX_SLEEP
+            try:
+                next_deadline = room_manager.next_deadline()
+            except Exception as e:
+                print(f"Scheduler error: {e}")
+                next_deadline = None
+            if next_deadline is not None:
+                wake_at = min(wake_at, next_deadline)
+            if wakeup_wait is None or wakeup_wait.done():
+                wakeup.clear()
+                wakeup_wait = asyncio.ensure_future(wakeup.wait())
+            await asyncio.wait(
+                (shutdown_wait, wakeup_wait),
+                timeout=max(0.0, wake_at - now),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if shutdown_wait.done():
+                return
+
+            now = time.monotonic()
+            try:
+                for game in room_manager.pop_picking_timeouts(now):
+                    asyncio.create_task(run_timer_handler(handle_picking_timeout, game.id, "Picking timer"))
+                for game in room_manager.pop_turn_timeouts(now):
+                    if turn_timeout_applies(game):
+                        asyncio.create_task(run_timer_handler(handle_turn_timeout, game.id, "Turn timer"))
+            except Exception as e:
+                print(f"Scheduler error: {e}")
+            run_cleanup()
+    finally:
+        room_manager.set_deadline_listener(None)
+        shutdown_wait.cancel()
+        if wakeup_wait is not None:
+            wakeup_wait.cancel()
+
+
+def run_cleanup():
+    """Clean up stale games."""
+    try:
+        count, reasons = room_manager.cleanup_stale_games()
+        if count > 0:
+            summary = ", ".join(f"{gid}:{reason}" for gid, reason in reasons)
+            print(f"Cleaned up {count} stale games: {summary}")
+    except Exception as e:
+        print(f"Cleanup error: {e}")
+
+
+async def run_timer_handler(handler, game_id: str, label: str):
+    """Run a timeout handler, logging instead of raising on errors."""
+    try:
+        await handler(game_id)
+    except Exception as e:
+        print(f"{label} error: {e}")
+
+
+def turn_timeout_applies(game: Game) -> bool:
+    """Whether a timed out turn should be auto-played."""
+    # Skip CPU turns - they handle themselves
+    if is_cpu_turn(game):
+        return False
+
+    # Only enforce timeout for connected players. A player who reconnects
+    # on their turn gets a fresh timer, which queues a new deadline.
+    current_player = game.get_player(game.current_turn)
+    return current_player is not None and current_player.connected
 
 
 async def handle_picking_timeout(game_id: str):
@@ -101,35 +186,7 @@ async def handle_picking_timeout(game_id: str):
     # If picking is now complete (transitioned to PLAYING), notify
     if game.status == GameStatus.PLAYING:
         await manager.broadcast_to_game(game_id, {"type": "game_started"})
-        await process_cpu_turns(game_id)
-
-
-async def turn_timer_task():
-    """Background task to check for turn timeouts and auto-play."""
-    while True:
-        await asyncio.sleep(1)  # Check every second
-        try:
-            for game in room_manager.list_active_games():
-                if game.status != GameStatus.PLAYING:
-                    continue
-                if game.turn_timeout <= 0:
-                    continue
-                if not game.turn_started_at:
-                    continue
-                # Skip CPU turns - they handle themselves
-                if is_cpu_turn(game):
-                    continue
-
-                # Only enforce timeout for connected players
-                current_player = game.get_player(game.current_turn)
-                if not current_player or not current_player.connected:
-                    continue
-
-                elapsed = (datetime.utcnow() - game.turn_started_at).total_seconds()
-                if elapsed >= game.turn_timeout:
-                    await handle_turn_timeout(game.id)
-        except Exception as e:
-            print(f"Turn timer error: {e}")
+        schedule_cpu_turn(game_id)
 
 
 async def handle_turn_timeout(game_id: str):
@@ -151,66 +208,61 @@ async def handle_turn_timeout(game_id: str):
 
     if valid_moves:
         # Auto-play a random valid move
-        domino, side = random.choice(valid_moves)
+        domino, side = game._rng.choice(valid_moves)
         success, _ = play_tile(game, player_id, domino, side)
 
         if success:
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_move(game_id, {
                 "type": "tile_played",
                 "player_id": player_id,
-                "domino": {"left": domino.left, "right": domino.right},
+                "domino": DOMINO_VIEWS[domino.left, domino.right],
                 "side": side,
                 "auto_played": True  # Flag that this was auto-played due to timeout
             })
-            await broadcast_game_state(game_id)
 
             if game.status == GameStatus.FINISHED:
                 await handle_round_end(game_id, game)
             else:
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
     else:
         # No valid moves - auto-pass
         success, _ = pass_turn(game, player_id)
 
         if success:
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_move(game_id, {
                 "type": "turn_passed",
                 "player_id": player_id,
                 "auto_passed": True  # Flag that this was auto-passed due to timeout
             })
-            await broadcast_game_state(game_id)
 
             if game.status == GameStatus.FINISHED:
                 await handle_round_end(game_id, game)
             else:
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     print("Dominoes server starting...")
-    # Start background tasks
-    cleanup = asyncio.create_task(cleanup_task())
-    turn_timer = asyncio.create_task(turn_timer_task())
-    picking_timer = asyncio.create_task(picking_timer_task())
-    yield
-    # Cancel background tasks on shutdown
-    cleanup.cancel()
-    turn_timer.cancel()
-    picking_timer.cancel()
-    try:
-        await cleanup
-    except asyncio.CancelledError:
-        pass
+    # Run new tasks eagerly up to their first real suspension (Python 3.12+). Most
+    # tasks spawned here (relays, CPU moves, timeouts) finish or park quickly.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    # Connections the manager drops itself are handled like client disconnects
+    manager.set_disconnect_listener(handle_player_left)
+    # Background task runs until shutdown is set. It's a plain task, not a task
+    # group around the yield, so even if it died it couldn't take the app down.
+    shutdown = asyncio.Event()
+    scheduler = asyncio.create_task(scheduler_task(shutdown))
     try:
-        await turn_timer
-    except asyncio.CancelledError:
-        pass
-    try:
-        await picking_timer
-    except asyncio.CancelledError:
-        pass
+        yield
+    finally:
+        shutdown.set()
+        try:
+            await scheduler
+        except Exception as e:
+            print(f"Scheduler error: {e}")
     print("Dominoes server shutting down...")
 
 
@@ -228,22 +280,39 @@ app.add_middleware(
 
 # REST endpoints for game management
 
+# Encoded /api/games bodies for the current lobby revision, by effective limit
+_open_games_cache: tuple[int, dict[Optional[int], str]] = (-1, {})
+
+
 @app.get("/api/games")
-async def list_games():
-    """List all open games."""
-    games = room_manager.list_open_games()
-    return {
-        "games": [
-            {
-                "id": g.id,
-                "variant": g.variant,
-                "players": len(g.players),
-                "max_players": g.max_players,
-                "player_names": [p.name for p in g.players]
-            }
-            for g in games
-        ]
-    }
+async def list_games(limit: Optional[int] = Query(default=None, ge=1)):
+    """List open games (all, or the oldest `limit`).
+
+    Lobby pages poll this, so the encoded body is reused until a game is
+    created, joined, started or removed.
+    """
+    global _open_games_cache
+    revision, bodies = _open_games_cache
+    if revision != room_manager.lobby_revision:
+        bodies = {}
+        _open_games_cache = (room_manager.lobby_revision, bodies)
+    if limit is not None and limit >= room_manager.games.count(GameStatus.WAITING):
+        limit = None  # Same listing as no limit
+    body = bodies.get(limit)
+    if body is None:
+        body = bodies[limit] = encode_message({
+            "games": [
+                {
+                    "id": g.id,
+                    "variant": g.variant,
+                    "players": len(g.players),
+                    "max_players": g.max_players,
+                    "player_names": [p.name for p in g.players]
+                }
+                for g in room_manager.list_open_games(limit)
+            ]
+        })
+    return Response(body, media_type="application/json")
 
 
 @app.post("/api/games")
@@ -295,10 +364,8 @@ async def delayed_game_termination(game_id: str, grace_period: int = 10):
     This allows players to reconnect after page refresh.
     """
     await asyncio.sleep(grace_period)
-    game = room_manager.get_game(game_id)
-    if game and not game.has_connected_humans():
+    if room_manager.delete_game(game_id, only_if=lambda game: not game.has_connected_humans()):
         print(f"Grace period expired, no humans reconnected to game {game_id}, terminating")
-        room_manager.delete_game(game_id)
 
 
 # WebSocket endpoint
@@ -306,6 +373,10 @@ async def delayed_game_termination(game_id: str, grace_period: int = 10):
 @app.websocket("/ws/{game_id}/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str):
     """WebSocket connection for game play."""
+    # IDs are interned at creation; interning the path copies makes every lookup
+    # for this connection's messages an identity match
+    game_id = sys.intern(game_id)
+    player_id = sys.intern(player_id)
     game = room_manager.get_game(game_id)
     if not game:
         await websocket.close(code=4004, reason="Game not found")
@@ -323,7 +394,7 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str)
         # If it's this player's turn and they just connected, reset their turn timer
         # This handles the case where game auto-started before player connected
         if game.status == GameStatus.PLAYING and game.current_turn == player_id:
-            game.turn_started_at = datetime.utcnow()
+            game.start_turn_timer()
 
         # Send initial game state
         await send_game_state(game_id, player_id)
@@ -342,41 +413,74 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str)
         # If game is already playing and it's a CPU's turn, process CPU turns
         # (handles auto-start scenario where CPU should play first)
         elif game.status == GameStatus.PLAYING and is_cpu_turn(game):
-            await process_cpu_turns(game_id)
+            schedule_cpu_turn(game_id)
 
         # Handle messages
         while True:
-            data = await websocket.receive_json()
-            await handle_message(game_id, player_id, data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            # Clients send text frames, but binary JSON is accepted too
+            raw = message.get("text")
+            if raw is None:
+                raw = message.get("bytes")
+            data = decode_message(raw) if raw is not None else None
+            if data is None:
+                await manager.send_to_player(game_id, player_id, {
+                    "type": "error",
+                    "message": "Invalid message"
+                })
+                continue
+            await handle_message(game, player, data)
 
     except WebSocketDisconnect:
-        manager.disconnect(game_id, player_id)
-        if player:
-            player.connected = False
-
-        # Check if game should be terminated (no human players left)
-        game = room_manager.get_game(game_id)
-        if game and not game.has_connected_humans():
-            # For waiting games, terminate immediately
-            if game.status == GameStatus.WAITING:
-                print(f"No human players remaining in waiting game {game_id}, terminating")
-                room_manager.delete_game(game_id)
-                return
-            # For active games, schedule delayed termination to allow reconnection
-            asyncio.create_task(delayed_game_termination(game_id, grace_period=10))
+        # Nothing to do if the server already dropped this socket, or the
+        # player has reconnected on another one
+        if manager.disconnect(game_id, player_id, websocket):
+            await handle_player_left(game_id, player_id)
 
-        await manager.broadcast_to_game(
-            game_id,
-            {"type": "player_disconnected", "player_id": player_id}
-        )
 
+async def handle_player_left(game_id: str, player_id: str):
+    """Mark a player whose connection went away as offline and tell the others.
 
-async def handle_message(game_id: str, player_id: str, data: dict):
-    """Handle incoming WebSocket messages."""
-    msg_type = data.get("type")
+    Runs both when the client disconnects and when the connection manager
+    drops a connection itself (failed send, client too far behind).
+    """
     game = room_manager.get_game(game_id)
-
     if not game:
+        return
+    player = game.get_player(player_id)
+    if player:
+        player.connected = False
+
+    # Check if game should be terminated (no human players left)
+    if not game.has_connected_humans():
+        # For waiting games, terminate immediately
+        if game.status == GameStatus.WAITING:
+            print(f"No human players remaining in waiting game {game_id}, terminating")
+            room_manager.delete_game(game_id)
+            return
+        # For active games, schedule delayed termination to allow reconnection
+        asyncio.create_task(delayed_game_termination(game_id, grace_period=10))
+
+    await manager.broadcast_to_game(
+        game_id,
+        {"type": "player_disconnected", "player_id": player_id}
+    )
+
+
+async def handle_message(game: Game, player: Player, data: dict):
+    """Handle incoming WebSocket messages.
+
+    The game and player are the ones the connection resolved when it opened.
+    Both stay the same objects across rounds (players are never removed from
+    a game), so the game is only checked to still be registered.
+    """
+    msg_type = data.get("type")
+    game_id = game.id
+    player_id = player.id
+
+    if game_id not in room_manager.games:
         await manager.send_to_player(game_id, player_id, {
             "type": "error",
             "message": "Game not found"
@@ -388,29 +492,33 @@ async def handle_message(game_id: str, player_id: str, data: dict):
 
     if msg_type == "play_tile":
         domino_data = data.get("domino", {})
-        domino = Domino(left=domino_data.get("left", 0), right=domino_data.get("right", 0))
+        domino = get_domino(domino_data.get("left", 0), domino_data.get("right", 0))
+        if domino is None:
+            await manager.send_to_player(game_id, player_id, {
+                "type": "error",
+                "message": "Invalid domino"
+            })
+            return
         side = data.get("side", "left")
 
-        success, message = play_tile(game, player_id, domino, side)
+        # One clock read shared by the move and the next turn's start
+        success, message = play_tile(game, player_id, domino, side, utc_now())
 
         if success:
             # Broadcast the move to all players
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_move(game_id, {
                 "type": "tile_played",
                 "player_id": player_id,
-                "domino": {"left": domino.left, "right": domino.right},
+                "domino": DOMINO_VIEWS[domino.left, domino.right],
                 "side": side
             })
 
-            # Send updated game state to all
-            await broadcast_game_state(game_id)
-
             # Check for game over (round end)
             if game.status == GameStatus.FINISHED:
                 await handle_round_end(game_id, game)
             else:
                 # Process CPU turns
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
@@ -418,20 +526,19 @@ async def handle_message(game_id: str, player_id: str, data: dict):
             })
 
     elif msg_type == "pass_turn":
-        success, message = pass_turn(game, player_id)
+        success, message = pass_turn(game, player_id, utc_now())
 
         if success:
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_move(game_id, {
                 "type": "turn_passed",
                 "player_id": player_id
             })
-            await broadcast_game_state(game_id)
 
             if game.status == GameStatus.FINISHED:
                 await handle_round_end(game_id, game)
             else:
                 # Process CPU turns
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
@@ -442,12 +549,11 @@ async def handle_message(game_id: str, player_id: str, data: dict):
         success, message = room_manager.start_game_early(game_id, player_id)
 
         if success:
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_game_state(game_id, {
                 "type": "game_started"
             })
-            await broadcast_game_state(game_id)
             # Process CPU turns if CPU starts
-            await process_cpu_turns(game_id)
+            schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
@@ -458,15 +564,14 @@ async def handle_message(game_id: str, player_id: str, data: dict):
         success, message, game_started = room_manager.add_cpu_player(game_id, player_id)
 
         if success:
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_player_added(game, {
                 "type": "cpu_added",
                 "player_count": len(game.players)
             })
-            await broadcast_game_state(game_id)
 
             if game_started:
                 await manager.broadcast_to_game(game_id, {"type": "game_started"})
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
@@ -486,21 +591,18 @@ async def handle_message(game_id: str, player_id: str, data: dict):
 
         if success:
             # Broadcast that a tile was claimed
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_game_state(game_id, {
                 "type": "tile_claimed",
                 "player_id": player_id,
                 "tile_index": tile_index
             })
 
-            # Broadcast updated game state
-            await broadcast_game_state(game_id)
-
             # If picking is complete, continue CPU claiming in background
             if game.status == GameStatus.PICKING:
                 asyncio.create_task(process_cpu_tile_claims(game_id))
             elif game.status == GameStatus.PLAYING:
                 await manager.broadcast_to_game(game_id, {"type": "game_started"})
-                await process_cpu_turns(game_id)
+                schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
@@ -512,21 +614,23 @@ async def handle_message(game_id: str, player_id: str, data: dict):
         await manager.send_to_player(game_id, player_id, {
             "type": "valid_moves",
             "moves": [
-                {"domino": {"left": d.left, "right": d.right}, "side": s}
+                {"domino": DOMINO_VIEWS[d.left, d.right], "side": s}
                 for d, s in moves
             ]
         })
 
+    elif msg_type == "get_game_state":
+        # Full resync, for a client whose state no longer lines up with the deltas
+        await send_game_state(game_id, player_id)
+
     elif msg_type == "reaction":
         # Send emoji reaction to all players
         emoji = data.get("emoji", "👍")
-        player = game.get_player(player_id)
-        player_name = player.name if player else "Unknown"
 
         await manager.broadcast_to_game(game_id, {
             "type": "reaction",
             "player_id": player_id,
-            "player_name": player_name,
+            "player_name": player.name,
             "emoji": emoji
         })
 
@@ -537,10 +641,7 @@ async def handle_message(game_id: str, player_id: str, data: dict):
             return
         # Truncate long messages
         text = text[:200]
-        player = game.get_player(player_id)
-        if not player:
-            return
-        player_position = game.players.index(player)
+        player_position = game.get_player_index(player_id)
 
         await manager.broadcast_to_game(game_id, {
             "type": "chat_message",
@@ -569,7 +670,7 @@ async def handle_message(game_id: str, player_id: str, data: dict):
             return
 
         # Only the first player (creator) can start next round
-        if not game.players or game.players[0].id != player_id:
+        if game.creator_id != player_id:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
                 "message": "Only the game creator can start the next round"
@@ -586,19 +687,22 @@ async def handle_message(game_id: str, player_id: str, data: dict):
 
         # Start next round
         if room_manager.start_next_round(match):
-            await manager.broadcast_to_game(game_id, {
+            await broadcast_game_state(game_id, {
                 "type": "round_started",
                 "round_number": game.round_number
             })
-            await broadcast_game_state(game_id)
             # Process CPU turns if CPU starts
-            await process_cpu_turns(game_id)
+            schedule_cpu_turn(game_id)
         else:
             await manager.send_to_player(game_id, player_id, {
                 "type": "error",
                 "message": "Could not start next round"
             })
 
+    elif msg_type == "skip_cpu_delay":
+        # A human doesn't want to wait for the CPU's "thinking" delay
+        hurry_cpu_turn(game_id)
+
     else:
         await manager.send_to_player(game_id, player_id, {
             "type": "error",
@@ -649,46 +753,81 @@ async def handle_round_end(game_id: str, game: Game):
         })
 
 
-async def process_cpu_turns(game_id: str):
-    """Process all consecutive CPU turns."""
+def schedule_cpu_turn(game_id: str):
+    """If it's a CPU's turn, schedule its move after a human-like delay.
+
+    Returns right away; the move runs from a timer and schedules the next
+    CPU move itself, so consecutive CPU turns don't hold up the caller.
+    """
     game = room_manager.get_game(game_id)
-    if not game or game.status != GameStatus.PLAYING:
+    if not game or game.status != GameStatus.PLAYING or not is_cpu_turn(game):
         return
+    if game_id in _cpu_turn_timers:
+        return  # Already scheduled
 
-    while is_cpu_turn(game):
-        # Add a random delay for UX (feels more human-like)
-        # In TEST_MODE, play instantly
-        if not TEST_MODE:
-            min_delay, max_delay = get_cpu_delay_range(game.cpu_speed)
-            delay = random.uniform(min_delay, max_delay)
-            await asyncio.sleep(delay)
+    # Add a random delay for UX (feels more human-like)
+    # In TEST_MODE, play instantly
+    delay = 0.0
+    if not TEST_MODE:
+        min_delay, max_delay = get_cpu_delay_range(game.cpu_speed)
+        delay = game._rng.uniform(min_delay, max_delay)
+    _cpu_turn_timers[game_id] = asyncio.get_running_loop().call_later(
+        delay, start_cpu_turn, game_id
+    )
 
-        cpu_player_id = game.current_turn
-        success, message, move = await execute_cpu_turn(game, cpu_player_id)
 
-        if success:
-            if move:
-                domino, side = move
-                await manager.broadcast_to_game(game_id, {
-                    "type": "tile_played",
-                    "player_id": cpu_player_id,
-                    "domino": {"left": domino.left, "right": domino.right},
-                    "side": side
-                })
-            else:
-                await manager.broadcast_to_game(game_id, {
-                    "type": "turn_passed",
-                    "player_id": cpu_player_id
-                })
+def start_cpu_turn(game_id: str):
+    """Timer callback: the delay is over, play the CPU move.
 
-            await broadcast_game_state(game_id)
+    The timer is unregistered here, before the move task exists, so a skip
+    arriving in between finds nothing pending rather than a fired handle.
+    """
+    _cpu_turn_timers.pop(game_id, None)
+    spawn(play_cpu_turn(game_id))
 
-            if game.status == GameStatus.FINISHED:
-                await handle_round_end(game_id, game)
-                break
-        else:
-            # CPU failed to make a move (shouldn't happen)
-            break
+
+def hurry_cpu_turn(game_id: str):
+    """Play a pending CPU move now instead of waiting out its delay."""
+    handle = _cpu_turn_timers.pop(game_id, None)
+    if handle is None:
+        return  # No CPU move waiting (or it's already being played)
+    handle.cancel()
+    spawn(play_cpu_turn(game_id))
+
+
+async def play_cpu_turn(game_id: str):
+    """Play one CPU move whose delay is over, then schedule the next one if needed."""
+    game = room_manager.get_game(game_id)
+    # Re-check game status after the delay
+    if not game or game.status != GameStatus.PLAYING or not is_cpu_turn(game):
+        return
+
+    cpu_player_id = game.current_turn
+    success, message, move = await execute_cpu_turn(game, cpu_player_id)
+    if not success:
+        # CPU failed to make a move (shouldn't happen)
+        return
+
+    if move:
+        domino, side = move
+        event = {
+            "type": "tile_played",
+            "player_id": cpu_player_id,
+            "domino": DOMINO_VIEWS[domino.left, domino.right],
+            "side": side
+        }
+    else:
+        event = {
+            "type": "turn_passed",
+            "player_id": cpu_player_id
+        }
+
+    await broadcast_move(game_id, event)
+
+    if game.status == GameStatus.FINISHED:
+        await handle_round_end(game_id, game)
+    else:
+        schedule_cpu_turn(game_id)
 
 
 async def process_cpu_tile_claims(game_id: str):
@@ -698,16 +837,16 @@ async def process_cpu_tile_claims(game_id: str):
     humans a fair chance. This runs as a background task and picks
     one tile at a time (round-robin across CPUs) until all have 6.
     """
-    # Prevent multiple concurrent tasks for the same game
-    if game_id in _cpu_picking_active:
+    game = room_manager.get_game(game_id)
+    if not game or game.status != GameStatus.PICKING:
         return
-    _cpu_picking_active.add(game_id)
 
-    try:
-        game = room_manager.get_game(game_id)
-        if not game or game.status != GameStatus.PICKING:
-            return
+    # Prevent multiple concurrent tasks for the same game
+    lock = game._cpu_picking_lock
+    if lock.locked():
+        return
 
+    async with lock:
         # Keep picking until all CPUs have 6 tiles or game moves on
         while game and game.status == GameStatus.PICKING:
             # Find CPUs that still need tiles
@@ -716,13 +855,13 @@ async def process_cpu_tile_claims(game_id: str):
                 break
 
             # Pick one tile for ONE random CPU (round-robin would be predictable)
-            cpu = random.choice(cpus_needing_tiles)
+            cpu = game._rng.choice(cpus_needing_tiles)
 
             # Delay before picking - gives humans time to pick
             # In TEST_MODE, pick instantly
             if not TEST_MODE:
                 min_delay, max_delay = get_cpu_pick_delay_range(game.cpu_speed)
-                delay = random.uniform(min_delay, max_delay)
+                delay = game._rng.uniform(min_delay, max_delay)
                 await asyncio.sleep(delay)
 
             # Re-check game status after delay
@@ -732,19 +871,32 @@ async def process_cpu_tile_claims(game_id: str):
 
             success, message, tile_index = cpu_claim_tile(game, cpu.id)
             if success:
-                await manager.broadcast_to_game(game_id, {
+                await broadcast_game_state(game_id, {
                     "type": "tile_claimed",
                     "player_id": cpu.id,
                     "tile_index": tile_index
                 })
-                await broadcast_game_state(game_id)
 
         # If picking complete, transition to playing
         if game and game.status == GameStatus.PLAYING:
             await manager.broadcast_to_game(game_id, {"type": "game_started"})
-            await process_cpu_turns(game_id)
-    finally:
-        _cpu_picking_active.discard(game_id)
+            schedule_cpu_turn(game_id)
+
+
+async def broadcast_player_added(game: Game, event: dict):
+    """Announce the player just seated at the last position.
+
+    While the game is still waiting, nothing but the player list has changed,
+    so the event carries the new player and clients append it. Otherwise
+    (e.g. the game filled up and started) the full state goes out with it.
+    """
+    if game.status == GameStatus.WAITING:
+        position = len(game.players) - 1
+        await manager.broadcast_to_game(game.id, {
+            **event, "player": create_player_view(game.players[position], position)
+        })
+    else:
+        await broadcast_game_state(game.id, event)
 
 
 async def send_game_state(game_id: str, player_id: str):
@@ -753,33 +905,107 @@ async def send_game_state(game_id: str, player_id: str):
     if not game:
         return
 
-    # Create a sanitized view for this player
-    state = create_player_game_view(game, player_id)
-    await manager.send_to_player(game_id, player_id, {
-        "type": "game_state",
-        "state": state
+    shared = encode_message(create_shared_view(game))
+    await manager.send_text_to_player(
+        game_id, player_id, encode_game_state(shared, create_private_overlay(game, player_id))
+    )
+
+
+async def broadcast_game_state(game_id: str, event: Optional[dict] = None):
+    """Broadcast game state to all players.
+
+    The state everyone sees is built and encoded once; each player only gets
+    their own hand spliced in alongside it. An event that caused the update
+    (tile played, turn passed, ...) can ride along in the same frame.
+    """
+    game = room_manager.get_game(game_id)
+    if not game:
+        return
+    connected_ids = manager.connected_player_ids(game_id)
+    if not connected_ids:
+        return  # Nobody to send to, don't build the view
+
+    shared = encode_message(create_shared_view(game))
+    event_text = encode_message(event) if event is not None else None
+    await manager.send_texts(game_id, {
+        player.id: encode_game_state(shared, create_private_overlay(game, player.id), event_text)
+        for player in game.players
+        if player.id in connected_ids
     })
 
 
-async def broadcast_game_state(game_id: str):
-    """Broadcast game state to all players (each gets their own view)."""
+async def broadcast_move(game_id: str, event: dict):
+    """Broadcast a tile_played / turn_passed event with what the move changed.
+
+    While the round goes on, a move only adds a board tile, changes the ends,
+    the turn and the mover's tile count (and hand), so a game_state_delta
+    with just those goes out. If the move ended the round, the full state
+    is sent instead.
+    """
     game = room_manager.get_game(game_id)
     if not game:
         return
+    if game.status != GameStatus.PLAYING:
+        await broadcast_game_state(game_id, event)
+        return
+    connected_ids = manager.connected_player_ids(game_id)
+    if not connected_ids:
+        return
 
-    for player in game.players:
-        if manager.is_connected(game_id, player.id):
-            state = create_player_game_view(game, player.id)
-            await manager.send_to_player(game_id, player.id, {
-                "type": "game_state",
-                "state": state
-            })
+    mover_id = event["player_id"]
+    mover = game.get_player(mover_id)
+    board_tile = None
+    if event["type"] == "tile_played":
+        played = game.board[0] if event["side"] == "left" else game.board[-1]
+        board_tile = [played.domino.code(), event["side"]]
 
+    shared = encode_message({
+        "current_turn": game.current_turn,
+        "ends": {"left": game.ends.left, "right": game.ends.right},
+        "turn_timer": create_turn_timer_view(game),
+        # [pip code, side] of the tile added to the board, None for a pass
+        "board_tile": board_tile,
+        "player": {"id": mover_id, "tile_count": len(mover.hand) if mover else 0},
+    })
+    event_text = encode_message(event)
+    await manager.send_texts(game_id, {
+        player.id: encode_game_state(
+            shared,
+            # Only the mover's hand changed
+            {"your_hand": player.hand_view()} if player.id == mover_id and board_tile else None,
+            event_text,
+            frame_type="game_state_delta",
+        )
+        for player in game.players
+        if player.id in connected_ids
+    })
 
-def create_player_game_view(game: Game, player_id: str) -> dict:
-    """Create a game state view for a specific player (hide other hands)."""
-    player = game.get_player(player_id)
 
+def encode_game_state(shared: str, private: Optional[dict], event: Optional[str] = None,
+                      frame_type: str = "game_state") -> str:
+    """Build a state frame from the pre-encoded shared part (and event) and a player's overlay."""
+    frame = f'{{"type":"{frame_type}","shared":{shared}'
+    if private is not None:
+        frame += f',"private":{encode_message(private)}'
+    if event is not None:
+        frame += f',"event":{event}'
+    return frame + "}"
+
+
+def create_turn_timer_view(game: Game) -> Optional[dict]:
+    """Turn timer info for the client, or None if no turn timer is running."""
+    if game.turn_timeout > 0 and game.turn_started_at and game.status == GameStatus.PLAYING:
+        remaining = max(0, game.turn_timeout - game.turn_elapsed())
+        return {
+            "timeout": game.turn_timeout,
+            "remaining": round(remaining, 1),
+            "started_at": game.turn_started_at.isoformat().replace("+00:00", "Z")
+        }
+    return None
+
+
+def create_shared_view(game: Game) -> dict:
+    """Create the part of the game state that is the same for every player (no hands)."""
     # Get match info if available
     match_state = None
     if game.match_id:
@@ -787,26 +1013,14 @@ def create_player_game_view(game: Game, player_id: str) -> dict:
         if match:
             match_state = room_manager.get_match_state(match)
 
-    # Calculate turn timer info
-    turn_timer_info = None
-    if game.turn_timeout > 0 and game.turn_started_at and game.status == GameStatus.PLAYING:
-        elapsed = (datetime.utcnow() - game.turn_started_at).total_seconds()
-        remaining = max(0, game.turn_timeout - elapsed)
-        turn_timer_info = {
-            "timeout": game.turn_timeout,
-            "remaining": round(remaining, 1),
-            "started_at": game.turn_started_at.isoformat() + "Z"
-        }
-
     # Calculate picking timer info
     picking_timer_info = None
     if game.picking_started_at and game.status == GameStatus.PICKING:
-        elapsed = (datetime.utcnow() - game.picking_started_at).total_seconds()
-        remaining = max(0, game.picking_timeout - elapsed)
+        remaining = max(0, game.picking_timeout - game.picking_elapsed())
         picking_timer_info = {
             "timeout": game.picking_timeout,
             "remaining": round(remaining, 1),
-            "started_at": game.picking_started_at.isoformat() + "Z"
+            "started_at": game.picking_started_at.isoformat().replace("+00:00", "Z")
         }
 
     return {
@@ -814,34 +1028,41 @@ def create_player_game_view(game: Game, player_id: str) -> dict:
         "variant": game.variant.value,
         "status": game.status.value,
         "current_turn": game.current_turn,
-        "your_player_id": player_id,
-        "your_hand": [{"left": d.left, "right": d.right} for d in player.hand] if player else [],
-        "board": [
-            {"domino": {"left": pd.domino.left, "right": pd.domino.right}, "position": pd.position}
-            for pd in game.board
-        ],
+        # Tiles as [pip code, position] pairs (see Domino.code)
+        "board": [[pd.domino.code(), i] for i, pd in enumerate(game.board)],
         "ends": {"left": game.ends.left, "right": game.ends.right},
-        "players": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "tile_count": len(p.hand),
-                "score": p.score,
-                "connected": p.connected,
-                "is_you": p.id == player_id,
-                "is_cpu": p.is_cpu,
-                "position": game.players.index(p)  # Seat position for table visualization
-            }
-            for p in game.players
-        ],
+        "players": [create_player_view(p, i) for i, p in enumerate(game.players)],
         "winner_id": game.winner_id,
         "boneyard_count": len(game.boneyard),
         "round_number": game.round_number,
         "match": match_state,
-        "turn_timer": turn_timer_info,
+        "turn_timer": create_turn_timer_view(game),
         "picking_timer": picking_timer_info,
-        # Picking phase: grid positions that still have tiles (face-down)
-        "available_tile_positions": list(game.picking_tiles.keys()) if game.status == GameStatus.PICKING else []
+        # Picking phase: grid positions that still have tiles (face-down). The claim
+        # functions keep this list in sync with picking_tiles, so no copy is made.
+        "available_tile_positions": game._available_positions if game.status == GameStatus.PICKING else ()
+    }
+
+
+def create_player_view(player: Player, position: int) -> dict:
+    """Public summary of a seated player, as listed in the shared view."""
+    return {
+        "id": player.id,
+        "name": player.name,
+        "tile_count": len(player.hand),
+        "score": player.score,
+        "connected": player.connected,
+        "is_cpu": player.is_cpu,
+        "position": position  # Seat position for table visualization
+    }
+
+
+def create_private_overlay(game: Game, player_id: str) -> dict:
+    """Create the player-specific part of the game state (their id and hand)."""
+    player = game.get_player(player_id)
+    return {
+        "your_player_id": player_id,
+        "your_hand": player.hand_view() if player else [],
     }
 
 
@@ -855,16 +1076,13 @@ async def join_game(game_id: str, request: JoinGameRequest):
         raise HTTPException(status_code=400, detail=error)
 
     # Notify existing players
-    await manager.broadcast_to_game(game_id, {
+    await broadcast_player_added(game, {
         "type": "player_joined",
         "player_id": player.id,
         "player_name": player.name,
         "player_count": len(game.players)
     })
 
-    # Always broadcast updated game state so waiting players see new count
-    await broadcast_game_state(game_id)
-
     # If game auto-started, notify everyone
     if game.status == GameStatus.PLAYING:
         await manager.broadcast_to_game(game_id, {"type": "game_started"})
@@ -880,19 +1098,44 @@ async def join_game(game_id: str, request: JoinGameRequest):
 # In Docker, backend is at /app and frontend dist is at /app/frontend/dist
 FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "frontend", "dist")
 
+
+class HashedAssets(StaticFiles):
+    """Static files whose names carry a content hash (Vite build output).
+
+    A changed file gets a new name, so browsers may cache these for good.
+    """
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 if os.path.exists(FRONTEND_DIR):
-    app.mount("/assets", StaticFiles(directory=os.path.join(FRONTEND_DIR, "assets")), name="assets")
+    app.mount("/assets", HashedAssets(directory=os.path.join(FRONTEND_DIR, "assets")), name="assets")
     # Serve images from public folder (copied to dist during build)
     images_dir = os.path.join(FRONTEND_DIR, "images")
     if os.path.exists(images_dir):
         app.mount("/images", StaticFiles(directory=images_dir), name="images")
 
+    # index.html only changes with a new build (and so a restart); it's kept in memory
+    # once read. Browsers revalidate it, so they pick up the new asset names after a deploy.
+    index_path = os.path.join(FRONTEND_DIR, "index.html")
+    _index_html: Optional[bytes] = None
+
     @app.get("/{full_path:path}")
     async def serve_frontend(full_path: str):
         """Serve frontend for all non-API routes."""
+        global _index_html
         if full_path.startswith("api/") or full_path.startswith("ws/"):
             raise HTTPException(status_code=404)
-        return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+        if _index_html is None:
+            # Read on first use, so a dist without index.html (half-finished build) can't break startup
+            if not os.path.exists(index_path):
+                raise HTTPException(status_code=404)
+            with open(index_path, "rb") as f:
+                _index_html = f.read()
+        return Response(_index_html, media_type="text/html", headers={"Cache-Control": "no-cache"})
 
 
 if __name__ == "__main__":
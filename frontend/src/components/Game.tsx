@@ -29,7 +29,7 @@ const PLAYER_COLORS: Record<number, { border: string; text: string }> = {
 
 export function Game() {
   const { gameState, selectedDomino, setSelectedDomino, reset, addReaction, passNotification, roundOverInfo, isChatOpen, setChatOpen, unreadChatCount } = useGameStore();
-  const { playTile, passTurn, startGame, addCpu, nextRound, claimTile, sendReaction, sendChatMessage, disconnect } = useWebSocket();
+  const { playTile, passTurn, startGame, addCpu, nextRound, claimTile, sendReaction, sendChatMessage, skipCpuDelay, disconnect } = useWebSocket();
   const [showMobileMenu, setShowMobileMenu] = useState(false);
   const { playTilePlace, playTileSelect, playTurnNotify, playVictory, playDefeat, playPass, playGameStart, playReaction } = useSound();
 
@@ -250,6 +250,7 @@ export function Game() {
               onStartGame={startGame}
               onNewGame={handleNewGame}
               onAddCpu={addCpu}
+              onSkipCpuDelay={skipCpuDelay}
               isYourTurn={isYourTurn}
               canPass={canPass()}
             />
@@ -271,6 +272,7 @@ export function Game() {
           onStartGame={startGame}
           onNewGame={handleNewGame}
           onAddCpu={addCpu}
+          onSkipCpuDelay={skipCpuDelay}
           isYourTurn={isYourTurn}
           canPass={canPass()}
         />
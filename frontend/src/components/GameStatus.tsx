@@ -7,11 +7,12 @@ interface GameStatusProps {
   onStartGame: () => void;
   onNewGame: () => void;
   onAddCpu: () => void;
+  onSkipCpuDelay: () => void;
   isYourTurn: boolean;
   canPass: boolean;
 }
 
-export function GameStatus({ onPass, onStartGame, onNewGame, onAddCpu, isYourTurn, canPass }: GameStatusProps) {
+export function GameStatus({ onPass, onStartGame, onNewGame, onAddCpu, onSkipCpuDelay, isYourTurn, canPass }: GameStatusProps) {
   const { gameState, connected, error } = useGameStore();
   const [copied, setCopied] = useState(false);
 
@@ -140,9 +141,21 @@ export function GameStatus({ onPass, onStartGame, onNewGame, onAddCpu, isYourTur
                 <p className="text-neon-amber font-medium text-lg">Your Turn</p>
               )
             ) : (
-              <p className="text-white">
-                Waiting for <span className="font-medium">{currentPlayer?.name}</span>...
-              </p>
+              <>
+                <p className="text-white">
+                  Waiting for <span className="font-medium">{currentPlayer?.name}</span>...
+                </p>
+                {/* Let impatient humans cut the CPU's thinking delay short */}
+                {currentPlayer?.is_cpu && (
+                  <button
+                    onClick={onSkipCpuDelay}
+                    data-testid="skip-cpu-delay-btn"
+                    className="mt-2 bg-whiskey hover:bg-whiskey-light text-white px-4 py-1 rounded-lg text-sm font-medium transition-colors"
+                  >
+                    Skip
+                  </button>
+                )}
+              </>
             )}
           </div>
 
@@ -1,6 +1,6 @@
 import { useEffect, useRef, useCallback } from 'react';
 import { useGameStore } from '../store/gameStore';
-import type { WSMessage, Domino, ChatMessage } from '../types';
+import type { WSMessage, Domino, ChatMessage, GameState, GameStateDelta, Player, SharedGameState, PrivateGameState } from '../types';
 
 const RECONNECT_KEY = 'barkak-reconnect-attempts';
 const MAX_RECONNECT_ATTEMPTS = 3;
@@ -19,6 +19,70 @@ function resetReconnectAttempts(): void {
   sessionStorage.removeItem(RECONNECT_KEY);
 }
 
+// Tile for each pip code (left * 7 + right) used in game_state frames
+const DOMINOES: Domino[] = Array.from({ length: 49 }, (_, code) => ({
+  left: Math.floor(code / 7),
+  right: code % 7,
+}));
+
+function mergeGameState(shared: SharedGameState, priv: PrivateGameState): GameState {
+  return {
+    ...shared,
+    your_player_id: priv.your_player_id,
+    your_hand: priv.your_hand.map((code) => DOMINOES[code]),
+    board: shared.board.map(([code, position]) => ({ domino: DOMINOES[code], position })),
+    players: shared.players.map((p) => ({ ...p, is_you: p.id === priv.your_player_id })),
+  };
+}
+
+// Apply a move delta. Returns null if the result doesn't line up with the
+// board ends the server sent, meaning a full state is needed.
+function applyGameStateDelta(state: GameState, delta: GameStateDelta, hand?: number[]): GameState | null {
+  let board = state.board;
+  if (delta.board_tile) {
+    const [code, side] = delta.board_tile;
+    const tiles = board.map((pd) => pd.domino);
+    if (side === 'left') {
+      tiles.unshift(DOMINOES[code]);
+    } else {
+      tiles.push(DOMINOES[code]);
+    }
+    board = tiles.map((domino, position) => ({ domino, position }));
+  }
+  if (board.length > 0 &&
+      (board[0].domino.left !== delta.ends.left || board[board.length - 1].domino.right !== delta.ends.right)) {
+    return null;
+  }
+  return {
+    ...state,
+    current_turn: delta.current_turn,
+    ends: delta.ends,
+    turn_timer: delta.turn_timer,
+    board,
+    players: state.players.map((p) =>
+      p.id === delta.player.id ? { ...p, tile_count: delta.player.tile_count } : p
+    ),
+    your_hand: hand ? hand.map((code) => DOMINOES[code]) : state.your_hand,
+  };
+}
+
+// Append a player announced while the game is waiting (no full state is sent then)
+function addPlayer(player: Omit<Player, 'is_you'>): void {
+  const { gameState, setGameState } = useGameStore.getState();
+  if (!gameState || gameState.players.some((p) => p.id === player.id)) return;
+  setGameState({ ...gameState, players: [...gameState.players, { ...player, is_you: false }] });
+}
+
+// Update a player's online flag (move deltas don't carry it)
+function setPlayerConnected(playerId: string, connected: boolean): void {
+  const { gameState, setGameState } = useGameStore.getState();
+  if (!gameState || !gameState.players.some((p) => p.id === playerId && p.connected !== connected)) return;
+  setGameState({
+    ...gameState,
+    players: gameState.players.map((p) => (p.id === playerId ? { ...p, connected } : p)),
+  });
+}
+
 export function useWebSocket() {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
@@ -108,6 +172,10 @@ export function useWebSocket() {
     ws.onmessage = (event) => {
       try {
         const message: WSMessage = JSON.parse(event.data);
+        // The event that caused a state update (if any) is handled before the new state
+        if ((message.type === 'game_state' || message.type === 'game_state_delta') && message.event) {
+          handleMessage(message.event);
+        }
         handleMessage(message);
       } catch (e) {
         console.error('Failed to parse message:', e);
@@ -118,9 +186,22 @@ export function useWebSocket() {
   const handleMessage = useCallback((message: WSMessage) => {
     switch (message.type) {
       case 'game_state':
-        setGameState(message.state);
+        setGameState(mergeGameState(message.shared, message.private));
         break;
 
+      case 'game_state_delta': {
+        // Use getState() so consecutive deltas build on each other
+        const current = useGameStore.getState().gameState;
+        const next = current && applyGameStateDelta(current, message.shared, message.private?.your_hand);
+        if (next) {
+          setGameState(next);
+        } else if (wsRef.current?.readyState === WebSocket.OPEN) {
+          // Missed or out of order update, ask for the full state
+          wsRef.current.send(JSON.stringify({ type: 'get_game_state' }));
+        }
+        break;
+      }
+
       case 'valid_moves':
         setValidMoves(message.moves);
         break;
@@ -225,14 +306,26 @@ export function useWebSocket() {
 
       case 'player_joined':
         console.log(`${message.player_name} joined`);
+        if (message.player) {
+          addPlayer(message.player);
+        }
+        break;
+
+      case 'player_connected':
+        console.log(`${message.player_name} connected`);
+        setPlayerConnected(message.player_id, true);
         break;
 
       case 'player_disconnected':
         console.log(`Player ${message.player_id} disconnected`);
+        setPlayerConnected(message.player_id, false);
         break;
 
       case 'cpu_added':
         console.log('CPU player added, count:', message.player_count);
+        if (message.player) {
+          addPlayer(message.player);
+        }
         break;
 
       case 'reaction':
@@ -332,6 +425,10 @@ export function useWebSocket() {
     send({ type: 'get_valid_moves' });
   }, [send]);
 
+  const skipCpuDelay = useCallback(() => {
+    send({ type: 'skip_cpu_delay' });
+  }, [send]);
+
   // Auto-connect when credentials are set
   useEffect(() => {
     if (gameId && playerId) {
@@ -354,6 +451,7 @@ export function useWebSocket() {
     sendReaction,
     sendChatMessage,
     requestValidMoves,
+    skipCpuDelay,
     disconnect,
   };
 }
@@ -127,6 +127,27 @@ export interface GameState {
   available_tile_positions?: number[];
 }
 
+// Game state as sent over the wire: the shared part is identical for every
+// player, the private part carries this player's id and hand.
+// Tiles are packed as pip codes: left * 7 + right
+export type SharedGameState = Omit<GameState, 'your_player_id' | 'your_hand' | 'players' | 'board'> & {
+  players: Omit<Player, 'is_you'>[];
+  board: [code: number, position: number][];
+};
+
+export type PrivateGameState = Pick<GameState, 'your_player_id'> & {
+  your_hand: number[];
+};
+
+// What a move changed, sent instead of the full state while a round goes on
+export interface GameStateDelta {
+  current_turn: string | null;
+  ends: BoardEnds;
+  turn_timer: TurnTimer | null;
+  board_tile: [code: number, side: 'left' | 'right'] | null;  // null for a pass
+  player: { id: string; tile_count: number };
+}
+
 export interface ValidMove {
   domino: Domino;
   side: 'left' | 'right';
@@ -134,8 +155,9 @@ export interface ValidMove {
 
 // WebSocket message types
 export type WSMessage =
-  | { type: 'game_state'; state: GameState }
-  | { type: 'player_joined'; player_id: string; player_name: string; player_count: number }
+  | { type: 'game_state'; shared: SharedGameState; private: PrivateGameState; event?: WSMessage }
+  | { type: 'game_state_delta'; shared: GameStateDelta; private?: { your_hand: number[] }; event?: WSMessage }
+  | { type: 'player_joined'; player_id: string; player_name: string; player_count: number; player?: Omit<Player, 'is_you'> }
   | { type: 'player_connected'; player_id: string; player_name: string }
   | { type: 'player_disconnected'; player_id: string }
   | { type: 'tile_played'; player_id: string; domino: Domino; side: string }
@@ -149,7 +171,7 @@ export type WSMessage =
       was_blocked: boolean; scores: Record<string, number>; match_winner: string | null; is_team_game: boolean }
   | { type: 'round_started'; round_number: number }
   | { type: 'match_over'; winner: string; is_team_game: boolean; final_scores: Record<string, number>; total_rounds: number }
-  | { type: 'cpu_added'; player_count: number }
+  | { type: 'cpu_added'; player_count: number; player?: Omit<Player, 'is_you'> }
   | { type: 'valid_moves'; moves: ValidMove[] }
   | { type: 'reaction'; player_id: string; player_name: string; emoji: string }
   | { type: 'chat_message'; player_id: string; player_name: string; player_position: number; text: string; timestamp: number }